@@ -0,0 +1,211 @@
+"""
+Shared file readers for the analyst modules
+
+Uses the PyArrow CSV engine and orjson when they are installed and falls
+back to the pandas C engine and the stdlib json module otherwise.
+"""
+
+import io
+import os
+import json
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Tuple, Union
+
+# pandas and pyarrow are imported on first use so that importing an analyst stays cheap
+if TYPE_CHECKING:
+    import pandas as pd
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+@lru_cache(maxsize=1)
+def _csv_engine() -> str:
+    """Return the fastest installed pandas CSV engine"""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return "c"
+    return "pyarrow"
+
+
+def read_csv(path: Union[str, Path], **kwargs) -> "pd.DataFrame":
+    """
+    Read a CSV file with the fastest available parser
+
+    Columns are NumPy-backed whichever parser is used, so callers see the same dtypes
+    and NaN semantics with or without pyarrow.
+
+    Args:
+        path: Path to the CSV file
+        **kwargs: Extra keyword arguments passed to pd.read_csv
+
+    Returns:
+        Parsed DataFrame
+    """
+    import pandas as pd
+
+    if _csv_engine() == "pyarrow":
+        try:
+            return pd.read_csv(path, engine="pyarrow", **kwargs)
+        except ValueError:
+            # Options the pyarrow engine does not support (e.g. nrows)
+            pass
+    return pd.read_csv(path, **kwargs)
+
+
+def read_csv_tail(path: Union[str, Path], rows: int, block_size: int = 64 * 1024, **kwargs) -> "pd.DataFrame":
+    """
+    Read only the header and the last rows of a CSV file
+
+    Seeks to the end of the file instead of parsing it from the start, so the cost
+    depends on the number of rows kept rather than the length of the history.
+    Rows must not contain quoted line breaks.
+
+    Args:
+        path: Path to the CSV file
+        rows: Number of trailing rows to keep
+        block_size: Bytes read from the end of the file on the first attempt
+        **kwargs: Extra keyword arguments passed to pd.read_csv
+
+    Returns:
+        DataFrame with the last `rows` rows and a default index
+    """
+    with open(path, 'rb') as f:
+        header = f.readline()
+        body_start = f.tell()
+        size = f.seek(0, os.SEEK_END)
+
+        while True:
+            start = max(body_start, size - block_size)
+            f.seek(start)
+            lines = f.read(size - start).splitlines(keepends=True)
+            if start > body_start:
+                # The first line of the block is usually cut off part way through
+                lines = lines[1:]
+            if len(lines) >= rows or start == body_start:
+                break
+            block_size *= 4
+
+    tail = lines[-rows:] if rows > 0 else []
+    if tail and not tail[-1].endswith(b'\n'):
+        tail[-1] += b'\n'
+    return read_csv(io.BytesIO(header + b''.join(tail)), **kwargs)
+
+
+def read_csv_cached(path: Union[str, Path], cache_dir: Union[str, Path]) -> "pd.DataFrame":
+    """
+    Read a CSV file through an Arrow IPC sidecar that is refreshed whenever the CSV changes
+
+    The sidecar is stored in cache_dir under a hash of the CSV's absolute path, so the data
+    directory is never written to. It is memory-mapped on later reads, which skips CSV
+    parsing entirely. Without pyarrow this is a plain read_csv.
+
+    Args:
+        path: Path to the CSV file
+        cache_dir: Directory holding the Arrow sidecars
+
+    Returns:
+        Parsed DataFrame with a default index
+    """
+    if _csv_engine() != "pyarrow":
+        return read_csv(path)
+
+    from pyarrow import feather
+
+    path = Path(path)
+    key = hashlib.blake2b(str(path.resolve()).encode('utf-8'), digest_size=16).hexdigest()
+    sidecar = Path(cache_dir) / f"{key}.arrow"
+    try:
+        if sidecar.stat().st_mtime_ns >= path.stat().st_mtime_ns:
+            return feather.read_table(sidecar, memory_map=True).to_pandas()
+    except FileNotFoundError:
+        pass
+
+    df = read_csv(path)
+    try:
+        sidecar.parent.mkdir(parents=True, exist_ok=True)
+        # Write under a temporary name so a concurrent reader never sees a partial file
+        tmp_path = sidecar.with_name(f"{sidecar.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        feather.write_feather(df, tmp_path, compression='uncompressed')
+        os.replace(tmp_path, sidecar)
+    except OSError:
+        # Cache directory not writable; keep working from the CSV
+        pass
+    return df
+
+
+def loads_json(data: Union[bytes, str]) -> Any:
+    """
+    Decode a JSON document, using orjson when available
+
+    Args:
+        data: Encoded JSON document
+
+    Returns:
+        Decoded JSON content
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def load_json(path: Union[str, Path]) -> Any:
+    """
+    Load a JSON file, using orjson when available
+
+    Args:
+        path: Path to the JSON file
+
+    Returns:
+        Decoded JSON content
+    """
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_files(base_path: Path, loaders: List[Tuple[str, str, Callable[[Path], Any]]]) -> Dict[str, Any]:
+    """
+    Load several independent files from a directory concurrently
+
+    Args:
+        base_path: Directory containing the files
+        loaders: (file name, data key, loader function) entries; missing files are skipped
+
+    Returns:
+        Dictionary mapping each data key to its loaded content, in loader order
+    """
+    # One directory listing instead of an exists() probe per file
+    with os.scandir(base_path) as entries:
+        names = {entry.name for entry in entries}
+    jobs = [(key, fn, base_path / name) for name, key, fn in loaders if name in names]
+    if not jobs:
+        return {}
+
+    with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+        futures = [(key, executor.submit(fn, path)) for key, fn, path in jobs]
+        return {key: future.result() for key, future in futures}
+
+
+def dumps_json(obj: Any) -> bytes:
+    """
+    Encode an object as UTF-8 JSON bytes, using orjson when available
+
+    Args:
+        obj: JSON-serializable object
+
+    Returns:
+        Encoded JSON document
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8')
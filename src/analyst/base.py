@@ -0,0 +1,958 @@
+"""
+Base Analyst
+
+Shared plumbing for the AI analysts:
+- OpenRouter client (pooled keep-alive sessions shared by every analyst)
+- Data loading driven by a per-analyst file table
+- Report caching, saving, batch and asyncio entry points
+
+Subclasses describe what is specific to them (input files, prompt text and
+report naming) and implement format_data_for_prompt.
+"""
+
+import os
+import re
+import time
+import asyncio
+import hashlib
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from datetime import datetime
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Set, Tuple, Union
+from src.analyst._io import load_files, dumps_json, loads_json
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+
+OPENROUTER_API_URL = "https://openrouter.ai/api/v1/chat/completions"
+
+# User turn of a chat request: plain text, or content parts (text and image_url) for multimodal prompts
+UserContent = Union[str, List[Dict[str, Any]]]
+
+# Appended to the system message when several tickers share one request
+BATCH_INSTRUCTIONS = (
+    "\n\nYou will receive data for several tickers, each introduced by a line '### TICKER <symbol>'. "
+    "Write a separate, complete report for every ticker. Start each report with a line '<<<TICKER:<symbol>>>>' "
+    "and end it with a line '<<<END>>>'. Do not write anything outside these blocks."
+)
+_BATCH_REPLY_RE = re.compile(r"<<<TICKER:([^>\s]+)>>>\s*(.*?)\s*<<<END>>>", re.S)
+
+# requests.Session is not thread-safe, so each thread gets its own session.
+# Sessions live at module level so every analyst (of any kind) reuses the same sockets.
+_thread_local = threading.local()
+
+
+def _get_shared_session() -> requests.Session:
+    """Return the pooled HTTP session owned by the calling thread"""
+    session = getattr(_thread_local, 'session', None)
+    if session is None:
+        session = requests.Session()
+        # Keep connections to OpenRouter alive between calls and retry transient failures
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=16,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=["POST"]
+            )
+        )
+        session.mount("https://", adapter)
+        session.headers.update({"Content-Type": "application/json"})
+        _thread_local.session = session
+    return session
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate how many tokens a prompt will use
+    
+    Uses tiktoken when installed and falls back to ~4 characters per token.
+    
+    Args:
+        text: Prompt text
+        
+    Returns:
+        Approximate token count
+    """
+    if tiktoken is not None:
+        try:
+            return len(_get_encoding().encode(text, disallowed_special=()))
+        except Exception:
+            pass
+    return len(text) // 4
+
+
+def frame_to_prompt(df: "pd.DataFrame", index: bool = True, pretty: bool = False,
+                    float_format: Union[str, Callable[[float], str], None] = None) -> str:
+    """
+    Serialize a DataFrame compactly for an AI prompt
+    
+    Pipe-separated rows skip the column-width scan of to_string() and carry no padding whitespace.
+    
+    Args:
+        df: DataFrame to serialize
+        index: Whether to include the row labels
+        pretty: Render an aligned to_string() table instead (handy when debugging prompts)
+        float_format: printf-style format (e.g. "%.6g") or formatting function for float columns;
+            None writes full precision
+            
+    Returns:
+        Pipe-separated text table
+    """
+    if pretty:
+        return df.to_string(index=index)
+    return df.to_csv(sep="|", index=index, lineterminator="\n", float_format=float_format).rstrip("\n")
+
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    """Load the tokenizer used for prompt size estimates"""
+    return tiktoken.get_encoding("cl100k_base")
+
+
+@lru_cache(maxsize=None)
+def _output_root(data_dir: str) -> Path:
+    """Return the data/output folder that sits next to a data/raw/{date} directory"""
+    base_path = Path(data_dir).parent  # Go up from ticker folder to data/raw parent
+    if base_path.name == 'raw':
+        base_path = base_path.parent  # Go up one more level to data/
+    return base_path / "output"
+
+
+class BaseAnalyst:
+    """Common OpenRouter, caching and report-saving logic for the AI analysts"""
+    
+    # Output folder name and report file suffix, e.g. 'fundamental'
+    SECTION_NAME = ""
+    # Title written at the top of saved reports, followed by ": {ticker}"
+    REPORT_TITLE = ""
+    # Report file name, filled with {ticker}, {section} and {timestamp}
+    REPORT_FILE_TEMPLATE = "{ticker}_{section}_analysis_{timestamp}.md"
+    # Role and report checklist; identical for every ticker so the provider can cache it
+    SYSTEM_MESSAGE = ""
+    # str.format_map template with {current_date}, {ticker} and {formatted_data}; only per-ticker content goes here
+    USER_PROMPT_TEMPLATE = ""
+    # (file name, data key, loader) for every input file the analyst reads
+    LOADERS: List[Tuple[str, str, Callable[[Path], Any]]] = []
+    
+    LOADING_MESSAGE = "Loading data for {ticker}..."
+    ANALYZING_MESSAGE = "Analyzing {ticker} using AI..."
+    
+    MODEL = "xiaomi/mimo-v2-flash:free"
+    # Model tried once when MODEL still fails after the transport retries; None (the default) disables it
+    FALLBACK_MODEL = None
+    TIMEOUT = 120
+    # Approximate token budget for the formatted data in the user prompt
+    MAX_PROMPT_TOKENS = 8000
+    
+    def __init__(self, api_key: Optional[str] = None, use_cache: bool = True, cache_dir: str = ".cache/analyst",
+                 cache_ttl: int = 24 * 3600, enable_prompt_cache: bool = True, fallback_model: Optional[str] = None):
+        """
+        Initialize the analyst
+        
+        Args:
+            api_key: OpenRouter API key. If None, will try to get from environment variable OPENROUTER_API_KEY
+            use_cache: Reuse loaded data and AI reports when the inputs have not changed
+            cache_dir: Directory where AI reports are cached between runs
+            cache_ttl: Number of seconds a cached AI report stays valid
+            enable_prompt_cache: Mark the system message for provider-side prompt caching
+            fallback_model: Model retried once when the main model fails. If None, uses FALLBACK_MODEL.
+                Replies from the fallback model are never stored in the report cache
+        """
+        self.api_key = api_key or os.environ.get('OPENROUTER_API_KEY')
+        if not self.api_key:
+            raise ValueError("OpenRouter API key must be provided or set in OPENROUTER_API_KEY environment variable")
+        
+        self.api_url = OPENROUTER_API_URL
+        self.model = self.MODEL
+        self.fallback_model = fallback_model or self.FALLBACK_MODEL
+        
+        self.use_cache = use_cache
+        self.cache_dir = Path(cache_dir)
+        self.cache_ttl = cache_ttl
+        # ticker path -> (directory fingerprint, loaded data)
+        self._data_cache = {}
+        # ticker -> (loaded data, formatted prompt text)
+        self._formatted_cache = {}
+        
+        self.enable_prompt_cache = enable_prompt_cache
+        self._auth_headers = {"Authorization": f"Bearer {self.api_key}"}
+    
+    def _get_session(self) -> requests.Session:
+        """Return the HTTP session shared by all analysts on the calling thread"""
+        return _get_shared_session()
+    
+    def _load_data_cached(self, ticker: str, data_dir: str) -> Dict[str, Any]:
+        """
+        Load data for a ticker, reusing the previous result if no file in its folder changed
+        
+        Args:
+            ticker: Stock ticker symbol
+            data_dir: Path to the data directory containing ticker folders
+            
+        Returns:
+            Dictionary containing all loaded data
+        """
+        ticker_path = Path(data_dir) / ticker
+        if not self.use_cache or not ticker_path.exists():
+            return self.load_data(ticker, data_dir)
+        
+        fingerprint = self._data_fingerprint(ticker_path)
+        key = str(ticker_path.resolve())
+        cached = self._data_cache.get(key)
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+        
+        data = self.load_data(ticker, data_dir)
+        self._data_cache[key] = (fingerprint, data)
+        return data
+    
+    def _format_data_cached(self, ticker: str, data: Dict[str, Any]) -> str:
+        """
+        Format loaded data for the prompt, reusing the previous text for the same data snapshot
+        
+        Args:
+            ticker: Stock ticker symbol
+            data: Dictionary returned by load_data (or the data cache)
+            
+        Returns:
+            Formatted string representation of the data
+        """
+        if not self.use_cache:
+            return self.format_data_for_prompt(data)
+        
+        # The data cache hands back the same object until a file changes, so identity is the key
+        cached = self._formatted_cache.get(ticker)
+        if cached is not None and cached[0] is data:
+            return cached[1]
+        
+        formatted_data = self.format_data_for_prompt(data)
+        self._formatted_cache[ticker] = (data, formatted_data)
+        return formatted_data
+    
+    def _data_fingerprint(self, ticker_path: Path) -> Tuple:
+        """
+        Summarize the input files so changes can be detected without reading them
+        
+        Args:
+            ticker_path: Folder holding the ticker's data files
+            
+        Returns:
+            Sorted (name, mtime, size) entries for every file in the folder
+        """
+        return tuple(sorted(
+            (entry.name, entry.stat().st_mtime_ns, entry.stat().st_size)
+            for entry in os.scandir(ticker_path)
+        ))
+    
+    def _report_cache_path(self, system_message: str, user_message: str, model: Optional[str] = None) -> Path:
+        """Cache file for the report generated from a given prompt and model"""
+        key = hashlib.blake2b(
+            "\0".join((model or self.model, system_message, user_message)).encode('utf-8'),
+            digest_size=16
+        ).hexdigest()
+        return self.cache_dir / f"{key}.md"
+    
+    def _read_cached_report(self, cache_path: Path) -> Optional[str]:
+        """Return the cached report if it exists and has not expired"""
+        try:
+            if time.time() - cache_path.stat().st_mtime < self.cache_ttl:
+                return cache_path.read_text(encoding='utf-8')
+        except FileNotFoundError:
+            pass
+        return None
+    
+    def _write_cached_report(self, cache_path: Path, report: str) -> None:
+        """Atomically store a report in the cache"""
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_text(report, encoding='utf-8')
+        os.replace(tmp_path, cache_path)
+    
+    def load_data(self, ticker: str, data_dir: str, include: Optional[Set[str]] = None) -> Dict[str, Any]:
+        """
+        Load all input data for a given ticker
+        
+        Args:
+            ticker: Stock ticker symbol (e.g., 'AAPL')
+            data_dir: Path to the data directory containing ticker folders
+            include: Data keys to load. If None, loads every file in LOADERS
+            
+        Returns:
+            Dictionary containing all loaded data
+        """
+        ticker_path = Path(data_dir) / ticker
+        
+        if not ticker_path.exists():
+            raise ValueError(f"Data directory for {ticker} not found at {ticker_path}")
+        
+        data = {
+            'ticker': ticker,
+            'data_path': str(ticker_path)
+        }
+        
+        loaders = self.LOADERS
+        if include is not None:
+            loaders = [loader for loader in loaders if loader[1] in include]
+        
+        # The files are independent, so read them concurrently
+        data.update(load_files(ticker_path, loaders))
+        
+        return data
+    
+    def format_data_for_prompt(self, data: Dict[str, Any]) -> str:
+        """
+        Format loaded data into a readable string for the AI prompt
+        
+        Args:
+            data: Dictionary returned by load_data
+            
+        Returns:
+            Formatted string representation of the data
+        """
+        raise NotImplementedError
+    
+    def _build_payload(self, system_message: str, user_message: UserContent, stream: bool = False,
+                       prompt_cache: bool = False, model: Optional[str] = None) -> bytes:
+        """Encode the chat completion request body"""
+        if prompt_cache:
+            # The system message is identical for every ticker, so let the provider cache its prefix
+            system_content = [{"type": "text", "text": system_message, "cache_control": {"type": "ephemeral"}}]
+        else:
+            system_content = system_message
+        
+        body = {
+            "model": model or self.model,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": system_content
+                },
+                {
+                    "role": "user",
+                    "content": user_message
+                }
+            ]
+        }
+        if stream:
+            body["stream"] = True
+        return dumps_json(body)
+    
+    def _shrink_data(self, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Return a trimmed copy of the loaded data for prompts over MAX_PROMPT_TOKENS
+        
+        The loaded data may be cached and must not be modified in place.
+        
+        Args:
+            data: Dictionary returned by load_data
+            
+        Returns:
+            Smaller copy of the data, or None if the analyst has nothing to trim
+        """
+        return None
+    
+    def _post(self, system_message: str, user_message: UserContent, stream: bool = False,
+              model: Optional[str] = None) -> requests.Response:
+        """
+        POST a chat completion request and return the successful response
+        
+        Args:
+            system_message: System prompt
+            user_message: User prompt, as text or a list of content parts
+            stream: Request a server-sent event stream
+            model: Model to request. If None, uses self.model
+            
+        Returns:
+            Response with a 2xx status
+        """
+        session = self._get_session()
+        payload = self._build_payload(system_message, user_message, stream, self.enable_prompt_cache, model)
+        response = session.post(self.api_url, data=payload, headers=self._auth_headers, timeout=self.TIMEOUT,
+                                stream=stream)
+        
+        if response.status_code == 400 and self.enable_prompt_cache and 'cache_control' in response.text:
+            # Some providers reject cache_control; resend this request as a plain prompt.
+            # Other 400s (context too long, unknown model) are raised as they are
+            response.close()
+            payload = self._build_payload(system_message, user_message, stream, model=model)
+            response = session.post(self.api_url, data=payload, headers=self._auth_headers, timeout=self.TIMEOUT,
+                                    stream=stream)
+        
+        response.raise_for_status()
+        return response
+    
+    def _request(self, system_message: str, user_message: UserContent, stream: bool = False,
+                 model: Optional[str] = None) -> Tuple[requests.Response, str]:
+        """
+        POST a chat completion request, retrying it once on the fallback model if the model fails
+        
+        Args:
+            system_message: System prompt
+            user_message: User prompt, as text or a list of content parts
+            stream: Request a server-sent event stream
+            model: Model to request. If None, uses self.model
+            
+        Returns:
+            Tuple of (response with a 2xx status, model that answered)
+        """
+        model = model or self.model
+        try:
+            return self._post(system_message, user_message, stream, model), model
+        except requests.exceptions.RequestException as e:
+            if not self._use_fallback(e, model):
+                raise
+            return self._post(system_message, user_message, stream, self.fallback_model), self.fallback_model
+    
+    def _complete(self, system_message: str, user_message: UserContent, model: Optional[str] = None) -> Tuple[str, str]:
+        """
+        Send one chat completion request to OpenRouter
+        
+        Args:
+            system_message: System prompt
+            user_message: User prompt, as text or a list of content parts
+            model: Model to request. If None, uses self.model
+            
+        Returns:
+            Tuple of (content of the reply, model that answered)
+        """
+        try:
+            response, answered_by = self._request(system_message, user_message, model=model)
+        except requests.exceptions.RequestException as e:
+            raise Exception(f"Error calling OpenRouter API: {str(e)}")
+        
+        result = loads_json(response.content)
+        return result['choices'][0]['message']['content'], answered_by
+    
+    def _call_llm(self, system_message: str, user_message: UserContent, model: Optional[str] = None) -> str:
+        """
+        Send one chat completion request to OpenRouter
+        
+        Args:
+            system_message: System prompt
+            user_message: User prompt, as text or a list of content parts
+            model: Model to request. If None, uses self.model
+            
+        Returns:
+            Content of the model's reply
+        """
+        return self._complete(system_message, user_message, model)[0]
+    
+    def _cache_reply(self, cache_path: Path, report: str, model: str, answered_by: str) -> None:
+        """Store a report in the cache unless it came from the fallback model rather than the requested one"""
+        if not self.use_cache:
+            return
+        if answered_by != model:
+            print(f"⚠ Reply came from {answered_by} instead of {model}; not caching it")
+            return
+        self._write_cached_report(cache_path, report)
+    
+    def _use_fallback(self, error: Exception, model: str) -> bool:
+        """Report a failed request and decide whether to retry it on the fallback model"""
+        if not self.fallback_model or self.fallback_model == model:
+            return False
+        print(f"✗ {model} failed ({error}), retrying with {self.fallback_model}")
+        return True
+    
+    def _stream_llm(self, system_message: str, user_message: UserContent, model: Optional[str] = None) -> Iterator[str]:
+        """
+        Send a streaming chat completion request to OpenRouter
+        
+        Args:
+            system_message: System prompt
+            user_message: User prompt, as text or a list of content parts
+            model: Model to request. If None, uses self.model
+            
+        Yields:
+            Pieces of the model's reply as they arrive
+        """
+        chunks, _ = self._open_stream(system_message, user_message, model)
+        yield from chunks
+    
+    def _open_stream(self, system_message: str, user_message: UserContent,
+                     model: Optional[str] = None) -> Tuple[Iterator[str], str]:
+        """
+        Start a streaming chat completion request to OpenRouter
+        
+        Args:
+            system_message: System prompt
+            user_message: User prompt, as text or a list of content parts
+            model: Model to request. If None, uses self.model
+            
+        Returns:
+            Tuple of (iterator over the pieces of the reply, model that answered)
+        """
+        try:
+            # Nothing has been streamed yet, so the whole reply can still come from the fallback model
+            response, answered_by = self._request(system_message, user_message, stream=True, model=model)
+        except requests.exceptions.RequestException as e:
+            raise Exception(f"Error calling OpenRouter API: {str(e)}")
+        return self._iter_stream(response), answered_by
+    
+    def _iter_stream(self, response: requests.Response) -> Iterator[str]:
+        """
+        Parse the server-sent events of a streaming response
+        
+        Args:
+            response: Streaming response returned by _request
+            
+        Yields:
+            Pieces of the model's reply as they arrive
+        """
+        try:
+            with response:
+                # Server-sent events: "data: {...}" frames, ": ..." keep-alive comments, "data: [DONE]" at the end
+                for line in response.iter_lines():
+                    if not line.startswith(b"data: "):
+                        continue
+                    frame = line[6:]
+                    if frame == b"[DONE]":
+                        break
+                    
+                    chunk = loads_json(frame)
+                    if 'error' in chunk:
+                        raise Exception(f"Error calling OpenRouter API: {chunk['error'].get('message', chunk['error'])}")
+                    content = chunk['choices'][0].get('delta', {}).get('content')
+                    if content:
+                        yield content
+        
+        except requests.exceptions.RequestException as e:
+            raise Exception(f"Error calling OpenRouter API: {str(e)}")
+    
+    def _prepare_prompt(self, ticker: str, data_dir: str,
+                        now: Optional[datetime] = None) -> Tuple[str, str, Path, Optional[str]]:
+        """
+        Load the ticker's data and build the user prompt
+        
+        Args:
+            ticker: Stock ticker symbol
+            data_dir: Path to the data directory
+            now: Time of the run used for the prompt date. If None, uses the current time
+            
+        Returns:
+            Tuple of (user message, model, report cache path, cached report or None)
+        """
+        # Load data
+        print(self.LOADING_MESSAGE.format(ticker=ticker))
+        data = self._load_data_cached(ticker, data_dir)
+        
+        # Format data for prompt, reusing the text while the loaded data is unchanged
+        formatted_data = self._format_data_cached(ticker, data)
+        
+        # Large prompts slow the model down (and can be rejected), so trim the data to fit the budget
+        if estimate_tokens(formatted_data) > self.MAX_PROMPT_TOKENS:
+            trimmed = self._shrink_data(data)
+            if trimmed is not None:
+                print(f"Prompt for {ticker} exceeds {self.MAX_PROMPT_TOKENS} tokens, trimming data...")
+                formatted_data = self.format_data_for_prompt(trimmed)
+        
+        # Prepare the prompt
+        current_date = (now or datetime.now()).strftime("%B %d, %Y")
+        
+        user_message = self.USER_PROMPT_TEMPLATE.format_map({
+            'current_date': current_date,
+            'ticker': ticker,
+            'formatted_data': formatted_data,
+        })
+        
+        model = self._choose_model(data, formatted_data)
+        
+        # Reuse a previous report generated from the exact same prompt
+        cache_path = self._report_cache_path(self.SYSTEM_MESSAGE, user_message, model)
+        cached_report = None
+        if self.use_cache:
+            cached_report = self._read_cached_report(cache_path)
+            if cached_report is not None:
+                print(f"Using cached analysis for {ticker}")
+        
+        return user_message, model, cache_path, cached_report
+    
+    def _choose_model(self, data: Dict[str, Any], formatted_data: str) -> str:
+        """
+        Pick the model for one ticker's request; subclasses can route light prompts to a faster model
+        
+        Args:
+            data: Dictionary returned by load_data
+            formatted_data: Data block of the user prompt
+            
+        Returns:
+            OpenRouter model name
+        """
+        return self.model
+    
+    def analyze(self, ticker: str, data_dir: str, now: Optional[datetime] = None) -> str:
+        """
+        Perform the analysis on a given ticker
+        
+        Args:
+            ticker: Stock ticker symbol
+            data_dir: Path to the data directory
+            now: Time of the run used for the prompt date. If None, uses the current time
+            
+        Returns:
+            Comprehensive analysis report
+        """
+        return self._analyze(ticker, data_dir, now)[0]
+    
+    def _analyze(self, ticker: str, data_dir: str, now: Optional[datetime] = None) -> Tuple[str, str]:
+        """
+        Perform the analysis and also report which model wrote it
+        
+        Args:
+            ticker: Stock ticker symbol
+            data_dir: Path to the data directory
+            now: Time of the run used for the prompt date. If None, uses the current time
+            
+        Returns:
+            Tuple of (analysis report, model that wrote it)
+        """
+        user_message, model, cache_path, cached_report = self._prepare_prompt(ticker, data_dir, now)
+        if cached_report is not None:
+            return cached_report, model
+        
+        # Call OpenRouter API
+        print(self.ANALYZING_MESSAGE.format(ticker=ticker))
+        analysis_report, answered_by = self._complete(self.SYSTEM_MESSAGE, user_message, model)
+        self._cache_reply(cache_path, analysis_report, model, answered_by)
+        
+        return analysis_report, answered_by
+    
+    def analyze_many(self, tickers: List[str], data_dir: str, batch_size: int = 6) -> Dict[str, str]:
+        """
+        Analyze several tickers, sending up to batch_size of them in a single OpenRouter request
+        
+        The system prompt and HTTP round trip are paid once per batch. Tickers that are
+        missing from a batched reply are retried individually.
+        
+        Args:
+            tickers: Stock ticker symbols
+            data_dir: Path to the data directory
+            batch_size: Maximum number of tickers per request
+            
+        Returns:
+            Dictionary mapping ticker to its analysis report
+        """
+        reports = {}
+        pending = []
+        now = datetime.now()
+        
+        for ticker in tickers:
+            user_message, model, cache_path, cached_report = self._prepare_prompt(ticker, data_dir, now)
+            if cached_report is not None:
+                reports[ticker] = cached_report
+            elif model != self.model:
+                # Routed to another model, so it cannot share a batched request
+                print(self.ANALYZING_MESSAGE.format(ticker=ticker))
+                reports[ticker], answered_by = self._complete(self.SYSTEM_MESSAGE, user_message, model)
+                self._cache_reply(cache_path, reports[ticker], model, answered_by)
+            else:
+                pending.append((ticker, user_message, cache_path))
+        
+        for start in range(0, len(pending), max(1, batch_size)):
+            batch = pending[start:start + max(1, batch_size)]
+            if len(batch) == 1:
+                ticker, user_message, cache_path = batch[0]
+                print(self.ANALYZING_MESSAGE.format(ticker=ticker))
+                report, answered_by = self._complete(self.SYSTEM_MESSAGE, user_message)
+                reply = {ticker: report}
+            else:
+                print(f"Analyzing {', '.join(t for t, _, _ in batch)} in one request...")
+                combined = "\n\n".join(f"### TICKER {ticker}\n{user_message}" for ticker, user_message, _ in batch)
+                response, answered_by = self._complete(self.SYSTEM_MESSAGE + BATCH_INSTRUCTIONS, combined)
+                reply = {match.group(1): match.group(2) for match in _BATCH_REPLY_RE.finditer(response)}
+            
+            for ticker, user_message, cache_path in batch:
+                report = reply.get(ticker)
+                ticker_answered_by = answered_by
+                if not report:
+                    # The model skipped or mangled this ticker's block
+                    print(self.ANALYZING_MESSAGE.format(ticker=ticker))
+                    report, ticker_answered_by = self._complete(self.SYSTEM_MESSAGE, user_message)
+                self._cache_reply(cache_path, report, self.model, ticker_answered_by)
+                reports[ticker] = report
+        
+        return reports
+    
+    def analyze_and_save(self, ticker: str, data_dir: str, output_dir: Optional[str] = None,
+                         stream: bool = True, run_timestamp: Optional[str] = None) -> str:
+        """
+        Analyze a ticker and save the report to a file
+        
+        Args:
+            ticker: Stock ticker symbol
+            data_dir: Path to the data directory
+            output_dir: Directory to save the report. If None, saves in data/output/{timestamp}/analyst/{SECTION_NAME}
+            stream: Write the report to disk as the model generates it instead of after the full reply
+            run_timestamp: Timestamp (YYYYMMDD_HHMMSS) shared by every report of one run. If None, uses the current time
+            
+        Returns:
+            Path to the saved report file
+        """
+        # One clock reading for the prompt date, output folder and report header
+        now = datetime.now()
+        
+        if not stream:
+            # Perform analysis
+            report, model = self._analyze(ticker, data_dir, now)
+            return self._save_report(ticker, report, data_dir, output_dir, run_timestamp, now, model)
+        
+        user_message, model, cache_path, cached_report = self._prepare_prompt(ticker, data_dir, now)
+        if cached_report is not None:
+            return self._save_report(ticker, cached_report, data_dir, output_dir, run_timestamp, now, model)
+        
+        # Call OpenRouter API, writing each chunk as soon as it arrives
+        print(self.ANALYZING_MESSAGE.format(ticker=ticker))
+        output_file = self._report_path(ticker, data_dir, output_dir, run_timestamp, now)
+        chunks = []
+        try:
+            with self._open_report(output_file) as f:
+                stream_chunks, answered_by = self._open_stream(self.SYSTEM_MESSAGE, user_message, model)
+                f.write(self._report_header(ticker, now, answered_by))
+                for chunk in stream_chunks:
+                    f.write(chunk)
+                    # Hand each delta to the OS right away so readers of the file see it as it arrives
+                    f.flush()
+                    chunks.append(chunk)
+        except Exception:
+            # Do not leave a truncated report behind
+            output_file.unlink(missing_ok=True)
+            raise
+        
+        self._cache_reply(cache_path, "".join(chunks), model, answered_by)
+        
+        print(f"Report saved to: {output_file}")
+        return str(output_file)
+    
+    def _report_path(self, ticker: str, data_dir: str, output_dir: Optional[str] = None,
+                     run_timestamp: Optional[str] = None, now: Optional[datetime] = None) -> Path:
+        """
+        Resolve the report file path; its directory is created by the batch helpers or _open_report
+        
+        Args:
+            ticker: Stock ticker symbol
+            data_dir: Path to the data directory
+            output_dir: Directory to save the report (see analyze_and_save)
+            run_timestamp: Timestamp shared by the whole run (see analyze_and_save)
+            now: Time of the run, used when run_timestamp is None. If None, uses the current time
+            
+        Returns:
+            Path of the report file to write
+        """
+        # Determine output path; the directory is created when the report is opened (see _open_report)
+        timestamp = run_timestamp or (now or datetime.now()).strftime("%Y%m%d_%H%M%S")
+        output_dir = self._prepare_output_dir(data_dir, output_dir, timestamp, create=False)
+        
+        return output_dir / self.REPORT_FILE_TEMPLATE.format(ticker=ticker, section=self.SECTION_NAME,
+                                                             timestamp=timestamp)
+    
+    def _prepare_output_dir(self, data_dir: str, output_dir: Optional[str], timestamp: str,
+                            create: bool = True) -> Path:
+        """
+        Resolve the report directory, creating it once per batch
+        
+        Args:
+            data_dir: Path to the data directory
+            output_dir: Directory to save the report (see analyze_and_save)
+            timestamp: Timestamp of the run
+            create: Create the directory now. Per-ticker paths pass False and leave it to _open_report
+            
+        Returns:
+            Output directory
+        """
+        if output_dir is None:
+            # Save in data/output/{timestamp}/analyst/{SECTION_NAME}/
+            output_dir = _output_root(data_dir) / timestamp / "analyst" / self.SECTION_NAME
+        else:
+            output_dir = Path(output_dir)
+        
+        if create:
+            output_dir.mkdir(parents=True, exist_ok=True)
+        
+        return output_dir
+    
+    @staticmethod
+    def _open_report(output_file: Path) -> IO[str]:
+        """
+        Open a report file for writing, creating its directory only if it is missing
+        
+        The batch helpers create the shared directory up front, so this normally costs a
+        single open. A directory removed during a long batch is recreated here.
+        
+        Args:
+            output_file: Report file to write
+            
+        Returns:
+            Text file opened for writing
+        """
+        try:
+            return open(output_file, 'w', encoding='utf-8')
+        except FileNotFoundError:
+            output_file.parent.mkdir(parents=True, exist_ok=True)
+            return open(output_file, 'w', encoding='utf-8')
+    
+    def _report_header(self, ticker: str, now: Optional[datetime] = None, model: Optional[str] = None) -> str:
+        """Title block written at the top of every saved report; subclasses may show the model that wrote it"""
+        return (
+            f"# {self.REPORT_TITLE}: {ticker}\n"
+            f"Generated: {(now or datetime.now()).strftime('%B %d, %Y at %I:%M %p')}\n\n"
+            "---\n\n"
+        )
+    
+    def _save_report(self, ticker: str, report: str, data_dir: str, output_dir: Optional[str] = None,
+                     run_timestamp: Optional[str] = None, now: Optional[datetime] = None,
+                     model: Optional[str] = None) -> str:
+        """
+        Write a finished report to disk
+        
+        Args:
+            ticker: Stock ticker symbol
+            report: Analysis report returned by analyze
+            data_dir: Path to the data directory
+            output_dir: Directory to save the report (see analyze_and_save)
+            run_timestamp: Timestamp shared by the whole run (see analyze_and_save)
+            now: Time of the run for the file name and header. If None, uses the current time
+            model: Model that wrote the report, passed on to the header
+            
+        Returns:
+            Path to the saved report file
+        """
+        output_file = self._report_path(ticker, data_dir, output_dir, run_timestamp, now)
+        
+        # Single write of header and body
+        with self._open_report(output_file) as f:
+            f.write(self._report_header(ticker, now, model) + report)
+        
+        print(f"Report saved to: {output_file}")
+        return str(output_file)
+    
+    async def analyze_async(self, ticker: str, data_dir: str) -> str:
+        """
+        Asynchronous variant of analyze for use inside an event loop
+        
+        The blocking OpenRouter call runs on a worker thread (with its own pooled session),
+        so several tickers can be awaited together with asyncio.gather.
+        
+        Args:
+            ticker: Stock ticker symbol
+            data_dir: Path to the data directory
+            
+        Returns:
+            Comprehensive analysis report
+        """
+        return await asyncio.to_thread(self.analyze, ticker, data_dir)
+    
+    async def analyze_and_save_async(self, ticker: str, data_dir: str, output_dir: Optional[str] = None,
+                                     stream: Optional[bool] = None, run_timestamp: Optional[str] = None) -> str:
+        """
+        Asynchronous variant of analyze_and_save
+        
+        Args:
+            ticker: Stock ticker symbol
+            data_dir: Path to the data directory
+            output_dir: Directory to save the report (see analyze_and_save)
+            stream: Write the report to disk as the model generates it. If None, uses the analyst's default
+            run_timestamp: Timestamp shared by the whole run (see analyze_and_save)
+            
+        Returns:
+            Path to the saved report file
+        """
+        kwargs = {'run_timestamp': run_timestamp}
+        if stream is not None:
+            kwargs['stream'] = stream
+        # The API call, directory creation and file writes all run off the event loop
+        return await asyncio.to_thread(self.analyze_and_save, ticker, data_dir, output_dir, **kwargs)
+    
+    def analyze_and_save_many(self, tickers: List[str], data_dir: str, output_dir: Optional[str] = None,
+                              max_workers: int = 8,
+                              run_timestamp: Optional[str] = None) -> Tuple[Dict[str, str], Dict[str, str]]:
+        """
+        Analyze several tickers concurrently and save one report per ticker
+        
+        The work is dominated by the OpenRouter round trip, so running the tickers on a
+        thread pool overlaps the in-flight requests instead of waiting on them one by one.
+        
+        Args:
+            tickers: Stock ticker symbols
+            data_dir: Path to the data directory
+            output_dir: Directory to save the reports (see analyze_and_save)
+            max_workers: Maximum number of concurrent API calls
+            run_timestamp: Timestamp shared by every report of the batch. If None, one is taken when the batch starts
+            
+        Returns:
+            Tuple of (successful, failed) dictionaries mapping ticker to report path / error message
+        """
+        successful = {}
+        failed = {}
+        # One timestamp for the whole batch so every report lands in the same output folder
+        run_timestamp = run_timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
+        # Create the shared folder once up front rather than once per ticker
+        output_dir = self._prepare_output_dir(data_dir, output_dir, run_timestamp)
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tickers)))) as executor:
+            futures = {
+                executor.submit(self.analyze_and_save, ticker=ticker, data_dir=data_dir, output_dir=output_dir,
+                                run_timestamp=run_timestamp): ticker
+                for ticker in tickers
+            }
+            for future in as_completed(futures):
+                ticker = futures[future]
+                try:
+                    successful[ticker] = future.result()
+                except Exception as e:
+                    print(f"✗ Error analyzing {ticker}: {e}")
+                    failed[ticker] = str(e)
+        
+        return successful, failed
+    
+    async def analyze_and_save_many_async(self, tickers: List[str], data_dir: str, output_dir: Optional[str] = None,
+                                          max_concurrency: int = 8,
+                                          run_timestamp: Optional[str] = None) -> Tuple[Dict[str, str], Dict[str, str]]:
+        """
+        Asynchronous variant of analyze_and_save_many
+        
+        Every ticker is scheduled on the event loop at once and a semaphore caps how many
+        OpenRouter calls are in flight, so the round trips overlap.
+        
+        Args:
+            tickers: Stock ticker symbols
+            data_dir: Path to the data directory
+            output_dir: Directory to save the reports (see analyze_and_save)
+            max_concurrency: Maximum number of concurrent API calls
+            run_timestamp: Timestamp shared by every report of the batch. If None, one is taken when the batch starts
+            
+        Returns:
+            Tuple of (successful, failed) dictionaries mapping ticker to report path / error message
+        """
+        run_timestamp = run_timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_dir = await asyncio.to_thread(self._prepare_output_dir, data_dir, output_dir, run_timestamp)
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        
+        async def run(ticker: str) -> str:
+            async with semaphore:
+                return await self.analyze_and_save_async(ticker, data_dir, output_dir, run_timestamp=run_timestamp)
+        
+        results = await asyncio.gather(*(run(ticker) for ticker in tickers), return_exceptions=True)
+        
+        successful = {}
+        failed = {}
+        for ticker, result in zip(tickers, results):
+            if isinstance(result, Exception):
+                print(f"✗ Error analyzing {ticker}: {result}")
+                failed[ticker] = str(result)
+            else:
+                successful[ticker] = result
+        
+        return successful, failed
@@ -8,94 +8,73 @@ This module analyzes financial data including:
 - Financial Reports (Balance Sheet, Income Statement, Cash Flow)
 """
 
-import os
-import json
-import pandas as pd
-import requests
-from datetime import datetime
+import csv
+from functools import partial
 from pathlib import Path
-from typing import Dict, Optional, Any
+from typing import TYPE_CHECKING, Dict, Optional, Any
+from src.analyst._io import _csv_engine, read_csv, load_json
+from src.analyst.base import BaseAnalyst, frame_to_prompt
 
+if TYPE_CHECKING:
+    import pandas as pd
 
-class FundamentalAnalyst:
+
+# Number of most recent annual columns kept from each financial statement
+_STATEMENT_YEARS = 3
+
+
+def _read_statement(path: Path) -> "pd.DataFrame":
+    """Read a financial statement CSV, parsing only the row labels and the most recent years"""
+    with open(path, 'r', newline='') as f:
+        header = next(csv.reader(f), [])
+    # Column names rather than positions, which the pyarrow engine does not accept
+    columns = header[:_STATEMENT_YEARS + 1]
+    if _csv_engine() != "pyarrow":
+        # The C engine labels an empty header cell 'Unnamed: <position>' instead of ''
+        columns = [name or f"Unnamed: {i}" for i, name in enumerate(columns)]
+    return read_csv(path, index_col=0, usecols=columns)
+
+
+class FundamentalAnalyst(BaseAnalyst):
     """Analyzes fundamental and financial statement data using AI"""
     
-    def __init__(self, api_key: Optional[str] = None):
-        """
-        Initialize the Fundamental Analyst
-        
-        Args:
-            api_key: OpenRouter API key. If None, will try to get from environment variable OPENROUTER_API_KEY
-        """
-        self.api_key = api_key or os.environ.get('OPENROUTER_API_KEY')
-        if not self.api_key:
-            raise ValueError("OpenRouter API key must be provided or set in OPENROUTER_API_KEY environment variable")
-        
-        self.api_url = "https://openrouter.ai/api/v1/chat/completions"
-        self.model = "xiaomi/mimo-v2-flash:free"
-        
-    def load_data(self, ticker: str, data_dir: str) -> Dict[str, Any]:
-        """
-        Load all fundamental data for a given ticker
-        
-        Args:
-            ticker: Stock ticker symbol (e.g., 'AAPL')
-            data_dir: Path to the data directory containing ticker folders
-            
-        Returns:
-            Dictionary containing all loaded data
-        """
-        ticker_path = Path(data_dir) / ticker
-        
-        if not ticker_path.exists():
-            raise ValueError(f"Data directory for {ticker} not found at {ticker_path}")
-        
-        data = {
-            'ticker': ticker,
-            'data_path': str(ticker_path)
-        }
-        
-        # Load Finviz Key Financial Stats
-        finviz_stats_path = ticker_path / "finviz_KeyFinanceStat_finviz.csv"
-        if finviz_stats_path.exists():
-            df = pd.read_csv(finviz_stats_path, index_col=0)
-            data['finviz_key_stats'] = df.to_dict()
-        
-        # Load Ticker Info (Business Summary, Sector, Industry)
-        ticker_info_path = ticker_path / "yfinance_TickerInfo.json"
-        if ticker_info_path.exists():
-            with open(ticker_info_path, 'r') as f:
-                data['ticker_info'] = json.load(f)
-        
-        # Load yfinance Key Financial Stats
-        yf_stats_path = ticker_path / "yfinance_KeyFinanceStat_yfiance.csv"
-        if yf_stats_path.exists():
-            df = pd.read_csv(yf_stats_path, index_col=0)
-            data['yfinance_key_stats'] = df.to_dict()
-        
-        # Load Historical Statistics
-        hist_stats_path = ticker_path / "yfinance_HistoricalStat.csv"
-        if hist_stats_path.exists():
-            df = pd.read_csv(hist_stats_path, index_col=0)
-            data['historical_stats'] = df.to_dict()
-        
-        # Load Financial Reports
-        balance_sheet_path = ticker_path / "yfinance_FinancialReport_Balance_Sheet.csv"
-        if balance_sheet_path.exists():
-            df = pd.read_csv(balance_sheet_path, index_col=0)
-            data['balance_sheet'] = df.to_dict()
-        
-        income_statement_path = ticker_path / "yfinance_FinancialReport_Income_Statement.csv"
-        if income_statement_path.exists():
-            df = pd.read_csv(income_statement_path, index_col=0)
-            data['income_statement'] = df.to_dict()
-        
-        cash_flow_path = ticker_path / "yfinance_FinancialReport_Cash_Flow.csv"
-        if cash_flow_path.exists():
-            df = pd.read_csv(cash_flow_path, index_col=0)
-            data['cash_flow'] = df.to_dict()
-        
-        return data
+    SECTION_NAME = "fundamental"
+    REPORT_TITLE = "Fundamental Analysis Report"
+    
+    LOADERS = [
+        ("finviz_KeyFinanceStat_finviz.csv", 'finviz_key_stats', partial(read_csv, index_col=0)),
+        ("yfinance_TickerInfo.json", 'ticker_info', load_json),
+        ("yfinance_KeyFinanceStat_yfiance.csv", 'yfinance_key_stats', partial(read_csv, index_col=0)),
+        ("yfinance_HistoricalStat.csv", 'historical_stats', partial(read_csv, index_col=0)),
+        ("yfinance_FinancialReport_Balance_Sheet.csv", 'balance_sheet', _read_statement),
+        ("yfinance_FinancialReport_Income_Statement.csv", 'income_statement', _read_statement),
+        ("yfinance_FinancialReport_Cash_Flow.csv", 'cash_flow', _read_statement),
+    ]
+    
+    SYSTEM_MESSAGE = (
+        "You are a researcher tasked with analyzing fundamental information over the past week about a company. "
+        "Please write a comprehensive report of the company's fundamental information such as financial documents, "
+        "company profile, basic company financials, and company financial history to gain a full view of the company's "
+        "fundamental information to inform traders. Make sure to include as much detail as possible. "
+        "Do not simply state the trends are mixed, provide detailed and fine-grained analysis and insights that may help traders make decisions. "
+        "Make sure to append a Markdown table at the end of the report to organize key points in the report, organized and easy to read."
+        "\n\nProvide a comprehensive fundamental analysis report that includes:\n"
+        "1. Company Overview and Business Model\n"
+        "2. Financial Health Analysis (Balance Sheet)\n"
+        "3. Profitability Analysis (Income Statement)\n"
+        "4. Cash Flow Analysis\n"
+        "5. Valuation Metrics and Trends\n"
+        "6. Key Strengths and Weaknesses\n"
+        "7. Investment Considerations\n"
+        "8. Summary table with key metrics and insights"
+    )
+    
+    USER_PROMPT_TEMPLATE = (
+        "Current Date: {current_date}\n"
+        "Company Ticker: {ticker}\n\n"
+        "Please analyze the following fundamental and financial data:\n\n"
+        "{formatted_data}\n"
+    )
     
     def format_data_for_prompt(self, data: Dict[str, Any]) -> str:
         """
@@ -123,206 +102,98 @@ class FundamentalAnalyst:
         # Key Financial Statistics from Finviz
         if 'finviz_key_stats' in data:
             sections.append("## Key Financial Statistics (Finviz)")
-            df = pd.DataFrame(data['finviz_key_stats'])
-            sections.append(df.to_string())
+            sections.append(frame_to_prompt(data['finviz_key_stats']))
             sections.append("")
         
         # Key Financial Statistics from yfinance
         if 'yfinance_key_stats' in data:
             sections.append("## Key Financial Statistics (Yahoo Finance)")
-            df = pd.DataFrame(data['yfinance_key_stats'])
-            sections.append(df.to_string())
+            sections.append(frame_to_prompt(data['yfinance_key_stats']))
             sections.append("")
         
         # Historical Statistics
         if 'historical_stats' in data:
             sections.append("## Historical Valuation Metrics")
-            df = pd.DataFrame(data['historical_stats'])
-            sections.append(df.to_string())
+            sections.append(frame_to_prompt(data['historical_stats']))
             sections.append("")
         
-        # Balance Sheet
+        # Balance Sheet (statements are trimmed to the most recent years at load time)
         if 'balance_sheet' in data:
             sections.append("## Balance Sheet (Annual)")
-            df = pd.DataFrame(data['balance_sheet'])
-            # Show only the most recent 3 years for brevity
-            if len(df.columns) > 3:
-                df = df.iloc[:, :3]
-            sections.append(df.to_string())
+            sections.append(frame_to_prompt(data['balance_sheet']))
             sections.append("")
         
         # Income Statement
         if 'income_statement' in data:
             sections.append("## Income Statement (Annual)")
-            df = pd.DataFrame(data['income_statement'])
-            # Show only the most recent 3 years for brevity
-            if len(df.columns) > 3:
-                df = df.iloc[:, :3]
-            sections.append(df.to_string())
+            sections.append(frame_to_prompt(data['income_statement']))
             sections.append("")
         
         # Cash Flow Statement
         if 'cash_flow' in data:
             sections.append("## Cash Flow Statement (Annual)")
-            df = pd.DataFrame(data['cash_flow'])
-            # Show only the most recent 3 years for brevity
-            if len(df.columns) > 3:
-                df = df.iloc[:, :3]
-            sections.append(df.to_string())
+            sections.append(frame_to_prompt(data['cash_flow']))
             sections.append("")
         
         return "\n".join(sections)
     
-    def analyze(self, ticker: str, data_dir: str) -> str:
+    def _shrink_data(self, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
-        Perform fundamental analysis on a given ticker
-        
-        Args:
-            ticker: Stock ticker symbol
-            data_dir: Path to the data directory
-            
-        Returns:
-            Comprehensive analysis report
-        """
-        # Load data
-        print(f"Loading data for {ticker}...")
-        data = self.load_data(ticker, data_dir)
-        
-        # Format data for prompt
-        formatted_data = self.format_data_for_prompt(data)
-        
-        # Prepare the prompt
-        current_date = datetime.now().strftime("%B %d, %Y")
+        Trim the data when the prompt is over budget
         
-        system_message = (
-            "You are a researcher tasked with analyzing fundamental information over the past week about a company. "
-            "Please write a comprehensive report of the company's fundamental information such as financial documents, "
-            "company profile, basic company financials, and company financial history to gain a full view of the company's "
-            "fundamental information to inform traders. Make sure to include as much detail as possible. "
-            "Do not simply state the trends are mixed, provide detailed and fine-grained analysis and insights that may help traders make decisions. "
-            "Make sure to append a Markdown table at the end of the report to organize key points in the report, organized and easy to read."
-        )
-        
-        user_message = (
-            f"Current Date: {current_date}\n"
-            f"Company Ticker: {ticker}\n\n"
-            f"Please analyze the following fundamental and financial data:\n\n"
-            f"{formatted_data}\n\n"
-            f"Provide a comprehensive fundamental analysis report that includes:\n"
-            f"1. Company Overview and Business Model\n"
-            f"2. Financial Health Analysis (Balance Sheet)\n"
-            f"3. Profitability Analysis (Income Statement)\n"
-            f"4. Cash Flow Analysis\n"
-            f"5. Valuation Metrics and Trends\n"
-            f"6. Key Strengths and Weaknesses\n"
-            f"7. Investment Considerations\n"
-            f"8. Summary table with key metrics and insights\n"
-        )
-        
-        # Call OpenRouter API
-        print(f"Analyzing {ticker} using AI...")
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
-        
-        payload = {
-            "model": self.model,
-            "messages": [
-                {
-                    "role": "system",
-                    "content": system_message
-                },
-                {
-                    "role": "user",
-                    "content": user_message
-                }
-            ]
-        }
-        
-        try:
-            response = requests.post(
-                self.api_url,
-                headers=headers,
-                json=payload,
-                timeout=120
-            )
-            response.raise_for_status()
-            
-            result = response.json()
-            analysis_report = result['choices'][0]['message']['content']
-            
-            return analysis_report
-            
-        except requests.exceptions.RequestException as e:
-            raise Exception(f"Error calling OpenRouter API: {str(e)}")
-    
-    def analyze_and_save(self, ticker: str, data_dir: str, output_dir: Optional[str] = None) -> str:
-        """
-        Analyze a ticker and save the report to a file
+        Keeps the two most recent years of each financial statement and the start of the business summary.
         
         Args:
-            ticker: Stock ticker symbol
-            data_dir: Path to the data directory
-            output_dir: Directory to save the report. If None, saves in data/output/{timestamp}/analyst/fundamental
+            data: Dictionary returned by load_data
             
         Returns:
-            Path to the saved report file
+            Trimmed copy of the data
         """
-        # Perform analysis
-        report = self.analyze(ticker, data_dir)
-        
-        # Determine output path
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
-        if output_dir is None:
-            # Save in data/output/{timestamp}/analyst/fundamental/
-            base_path = Path(data_dir).parent  # Go up from ticker folder to data/raw parent
-            if base_path.name == 'raw':
-                base_path = base_path.parent  # Go up one more level to data/
-            output_dir = base_path / "output" / timestamp / "analyst" / "fundamental"
-        else:
-            output_dir = Path(output_dir)
-        
-        output_dir.mkdir(parents=True, exist_ok=True)
+        trimmed = dict(data)
         
-        # Save report
-        output_file = output_dir / f"{ticker}_fundamental_analysis_{timestamp}.md"
+        for key in ('balance_sheet', 'income_statement', 'cash_flow'):
+            if key in trimmed:
+                trimmed[key] = trimmed[key].iloc[:, :2]
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(f"# Fundamental Analysis Report: {ticker}\n")
-            f.write(f"Generated: {datetime.now().strftime('%B %d, %Y at %I:%M %p')}\n\n")
-            f.write("---\n\n")
-            f.write(report)
+        if 'ticker_info' in trimmed:
+            info = dict(trimmed['ticker_info'])
+            summary = info.get('longBusinessSummary')
+            if isinstance(summary, str) and len(summary) > 500:
+                info['longBusinessSummary'] = summary[:500] + "..."
+            trimmed['ticker_info'] = info
         
-        print(f"Report saved to: {output_file}")
-        return str(output_file)
+        return trimmed
 
 
 def main():
     """Example usage of the Fundamental Analyst"""
     import argparse
     
-    parser = argparse.ArgumentParser(description='Analyze fundamental data for a stock ticker')
-    parser.add_argument('ticker', type=str, help='Stock ticker symbol (e.g., AAPL)')
+    parser = argparse.ArgumentParser(description='Analyze fundamental data for one or more stock tickers')
+    parser.add_argument('tickers', type=str, nargs='+', help='Stock ticker symbol(s) (e.g., AAPL MSFT)')
     parser.add_argument('--data-dir', type=str, required=True, help='Path to data directory')
     parser.add_argument('--api-key', type=str, help='OpenRouter API key (or set OPENROUTER_API_KEY env var)')
     parser.add_argument('--output-dir', type=str, help='Directory to save report (default: ticker data directory)')
+    parser.add_argument('--max-workers', type=int, default=8, help='Maximum number of tickers analyzed concurrently')
     
     args = parser.parse_args()
     
     # Initialize analyst
     analyst = FundamentalAnalyst(api_key=args.api_key)
     
-    # Analyze and save report
-    report_path = analyst.analyze_and_save(
-        ticker=args.ticker,
+    # Analyze and save reports
+    successful, failed = analyst.analyze_and_save_many(
+        tickers=args.tickers,
         data_dir=args.data_dir,
-        output_dir=args.output_dir
+        output_dir=args.output_dir,
+        max_workers=args.max_workers
     )
     
-    print(f"\n✓ Analysis complete!")
-    print(f"Report: {report_path}")
+    print(f"\n✓ Analysis complete! ({len(successful)}/{len(args.tickers)} succeeded)")
+    for ticker, report_path in successful.items():
+        print(f"Report ({ticker}): {report_path}")
+    for ticker, error in failed.items():
+        print(f"✗ {ticker}: {error}")
 
 
 if __name__ == "__main__":
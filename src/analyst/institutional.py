@@ -8,78 +8,69 @@ This module analyzes ownership and insider trading data including:
 - Insider Purchase Activity
 """
 
-import os
-import json
-import pandas as pd
-import requests
-from datetime import datetime
-from pathlib import Path
-from typing import Dict, Optional, Any
+from functools import partial
+from typing import Dict, Any
+from src.analyst._io import read_csv
+from src.analyst.base import BaseAnalyst, frame_to_prompt
 
 
-class InstitutionalAnalyst:
+class InstitutionalAnalyst(BaseAnalyst):
     """Analyzes institutional ownership and insider trading data using AI"""
     
-    def __init__(self, api_key: Optional[str] = None):
-        """
-        Initialize the Institutional Analyst
-        
-        Args:
-            api_key: OpenRouter API key. If None, will try to get from environment variable OPENROUTER_API_KEY
-        """
-        self.api_key = api_key or os.environ.get('OPENROUTER_API_KEY')
-        if not self.api_key:
-            raise ValueError("OpenRouter API key must be provided or set in OPENROUTER_API_KEY environment variable")
-        
-        self.api_url = "https://openrouter.ai/api/v1/chat/completions"
-        self.model = "xiaomi/mimo-v2-flash:free"
-        
-    def load_data(self, ticker: str, data_dir: str) -> Dict[str, Any]:
-        """
-        Load all institutional and insider data for a given ticker
-        
-        Args:
-            ticker: Stock ticker symbol (e.g., 'AAPL')
-            data_dir: Path to the data directory containing ticker folders
-            
-        Returns:
-            Dictionary containing all loaded data
-        """
-        ticker_path = Path(data_dir) / ticker
-        
-        if not ticker_path.exists():
-            raise ValueError(f"Data directory for {ticker} not found at {ticker_path}")
-        
-        data = {
-            'ticker': ticker,
-            'data_path': str(ticker_path)
-        }
-        
-        # Load Holding Breakdown
-        holding_breakdown_path = ticker_path / "yfinance_HoldingBreakdown.csv"
-        if holding_breakdown_path.exists():
-            df = pd.read_csv(holding_breakdown_path, index_col=0)
-            data['holding_breakdown'] = df.to_dict()
-        
-        # Load Major Institutional Holders
-        institutional_holders_path = ticker_path / "yfinance_MajorInstitutionalHolders.csv"
-        if institutional_holders_path.exists():
-            df = pd.read_csv(institutional_holders_path)
-            data['institutional_holders'] = df.to_dict('records')
-        
-        # Load Major Mutual Fund Holders
-        mutual_fund_holders_path = ticker_path / "yfinance_MajorMutualFundHolders.csv"
-        if mutual_fund_holders_path.exists():
-            df = pd.read_csv(mutual_fund_holders_path)
-            data['mutual_fund_holders'] = df.to_dict('records')
-        
-        # Load Insider Purchase Activity
-        insider_purchase_path = ticker_path / "yfinance_InsiderPurchase.csv"
-        if insider_purchase_path.exists():
-            df = pd.read_csv(insider_purchase_path)
-            data['insider_purchases'] = df.to_dict('records')
-        
-        return data
+    SECTION_NAME = "institutional"
+    REPORT_TITLE = "Institutional & Insider Activity Analysis Report"
+    LOADING_MESSAGE = "Loading institutional data for {ticker}..."
+    ANALYZING_MESSAGE = "Analyzing {ticker} institutional data using AI..."
+    
+    # Render aligned to_string() tables instead of pipe-separated rows (debugging aid)
+    PRETTY_TABLES = False
+    
+    # (file name, data key, loader) for each input file; load_data reads them concurrently
+    LOADERS = [
+        ("yfinance_HoldingBreakdown.csv", 'holding_breakdown', partial(read_csv, index_col=0)),
+        ("yfinance_MajorInstitutionalHolders.csv", 'institutional_holders', read_csv),
+        ("yfinance_MajorMutualFundHolders.csv", 'mutual_fund_holders', read_csv),
+        ("yfinance_InsiderPurchase.csv", 'insider_purchases', read_csv),
+    ]
+    
+    SYSTEM_MESSAGE = (
+        "You are a financial analyst specializing in institutional ownership and insider trading analysis. "
+        "Your task is to analyze institutional holdings, mutual fund positions, and insider trading activity "
+        "to provide insights into smart money movements and potential market signals. "
+        "Provide detailed analysis of ownership concentration, institutional sentiment, and insider confidence. "
+        "Do not simply state that the trends are mixed, provide detailed and fine-grained analysis and insights "
+        "that may help traders understand institutional behavior and insider sentiment. "
+        "Make sure to append a Markdown table at the end of the report to organize key points in the report, "
+        "organized and easy to read."
+        "\n\nProvide a comprehensive institutional analysis report that includes:\n"
+        "1. Ownership Structure Overview (from Holding Breakdown)\n"
+        "2. Major Institutional Holders Analysis\n"
+        "   - Who are the largest institutional investors?\n"
+        "   - What percentage of shares do they control?\n"
+        "   - Are there any notable changes in positions?\n"
+        "3. Mutual Fund Holdings Analysis\n"
+        "   - Which mutual funds have significant positions?\n"
+        "   - What does this tell us about the stock's appeal to retail-focused funds?\n"
+        "4. Insider Trading Activity Analysis\n"
+        "   - Recent insider purchases and sales\n"
+        "   - Insider sentiment (bullish/bearish signals)\n"
+        "   - Significance of insider transactions\n"
+        "5. Institutional Ownership Concentration\n"
+        "   - Is ownership concentrated or diversified?\n"
+        "   - Implications for stock volatility and liquidity\n"
+        "6. Smart Money Signals\n"
+        "   - What do institutional moves suggest about future prospects?\n"
+        "   - Alignment or divergence between institutions and insiders\n"
+        "7. Key Takeaways and Trading Implications\n"
+        "8. Summary table with key institutional metrics and insights"
+    )
+    
+    USER_PROMPT_TEMPLATE = (
+        "Current Date: {current_date}\n"
+        "Company Ticker: {ticker}\n\n"
+        "Please analyze the following institutional and insider activity data:\n\n"
+        "{formatted_data}\n"
+    )
     
     def format_data_for_prompt(self, data: Dict[str, Any]) -> str:
         """
@@ -100,17 +91,16 @@ class InstitutionalAnalyst:
         if 'holding_breakdown' in data:
             sections.append("## Holding Breakdown")
             sections.append("*Composition of holdings by category*\n")
-            df = pd.DataFrame(data['holding_breakdown'])
-            sections.append(df.to_string())
+            sections.append(frame_to_prompt(data['holding_breakdown'], pretty=self.PRETTY_TABLES))
             sections.append("")
         
         # Major Institutional Holders
         if 'institutional_holders' in data:
             sections.append("## Major Institutional Holders")
             sections.append("*Top institutional investors and their holdings*\n")
-            df = pd.DataFrame(data['institutional_holders'])
+            df = data['institutional_holders']
             if not df.empty:
-                sections.append(df.to_string(index=False))
+                sections.append(frame_to_prompt(df, index=False, pretty=self.PRETTY_TABLES))
             else:
                 sections.append("No institutional holder data available.")
             sections.append("")
@@ -119,9 +109,9 @@ class InstitutionalAnalyst:
         if 'mutual_fund_holders' in data:
             sections.append("## Major Mutual Fund Holders")
             sections.append("*Top mutual funds holding this stock*\n")
-            df = pd.DataFrame(data['mutual_fund_holders'])
+            df = data['mutual_fund_holders']
             if not df.empty:
-                sections.append(df.to_string(index=False))
+                sections.append(frame_to_prompt(df, index=False, pretty=self.PRETTY_TABLES))
             else:
                 sections.append("No mutual fund holder data available.")
             sections.append("")
@@ -130,153 +120,14 @@ class InstitutionalAnalyst:
         if 'insider_purchases' in data:
             sections.append("## Insider Purchase Activity")
             sections.append("*Recent insider buying and selling transactions*\n")
-            df = pd.DataFrame(data['insider_purchases'])
+            df = data['insider_purchases']
             if not df.empty:
-                sections.append(df.to_string(index=False))
+                sections.append(frame_to_prompt(df, index=False, pretty=self.PRETTY_TABLES))
             else:
                 sections.append("No insider purchase data available.")
             sections.append("")
         
         return "\n".join(sections)
-    
-    def analyze(self, ticker: str, data_dir: str) -> str:
-        """
-        Perform institutional and insider activity analysis on a given ticker
-        
-        Args:
-            ticker: Stock ticker symbol
-            data_dir: Path to the data directory
-            
-        Returns:
-            Comprehensive analysis report
-        """
-        # Load data
-        print(f"Loading institutional data for {ticker}...")
-        data = self.load_data(ticker, data_dir)
-        
-        # Format data for prompt
-        formatted_data = self.format_data_for_prompt(data)
-        
-        # Prepare the prompt
-        current_date = datetime.now().strftime("%B %d, %Y")
-        
-        system_message = (
-            "You are a financial analyst specializing in institutional ownership and insider trading analysis. "
-            "Your task is to analyze institutional holdings, mutual fund positions, and insider trading activity "
-            "to provide insights into smart money movements and potential market signals. "
-            "Provide detailed analysis of ownership concentration, institutional sentiment, and insider confidence. "
-            "Do not simply state that the trends are mixed, provide detailed and fine-grained analysis and insights "
-            "that may help traders understand institutional behavior and insider sentiment. "
-            "Make sure to append a Markdown table at the end of the report to organize key points in the report, "
-            "organized and easy to read."
-        )
-        
-        user_message = (
-            f"Current Date: {current_date}\n"
-            f"Company Ticker: {ticker}\n\n"
-            f"Please analyze the following institutional and insider activity data:\n\n"
-            f"{formatted_data}\n\n"
-            f"Provide a comprehensive institutional analysis report that includes:\n"
-            f"1. Ownership Structure Overview (from Holding Breakdown)\n"
-            f"2. Major Institutional Holders Analysis\n"
-            f"   - Who are the largest institutional investors?\n"
-            f"   - What percentage of shares do they control?\n"
-            f"   - Are there any notable changes in positions?\n"
-            f"3. Mutual Fund Holdings Analysis\n"
-            f"   - Which mutual funds have significant positions?\n"
-            f"   - What does this tell us about the stock's appeal to retail-focused funds?\n"
-            f"4. Insider Trading Activity Analysis\n"
-            f"   - Recent insider purchases and sales\n"
-            f"   - Insider sentiment (bullish/bearish signals)\n"
-            f"   - Significance of insider transactions\n"
-            f"5. Institutional Ownership Concentration\n"
-            f"   - Is ownership concentrated or diversified?\n"
-            f"   - Implications for stock volatility and liquidity\n"
-            f"6. Smart Money Signals\n"
-            f"   - What do institutional moves suggest about future prospects?\n"
-            f"   - Alignment or divergence between institutions and insiders\n"
-            f"7. Key Takeaways and Trading Implications\n"
-            f"8. Summary table with key institutional metrics and insights\n"
-        )
-        
-        # Call OpenRouter API
-        print(f"Analyzing {ticker} institutional data using AI...")
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
-        
-        payload = {
-            "model": self.model,
-            "messages": [
-                {
-                    "role": "system",
-                    "content": system_message
-                },
-                {
-                    "role": "user",
-                    "content": user_message
-                }
-            ]
-        }
-        
-        try:
-            response = requests.post(
-                self.api_url,
-                headers=headers,
-                json=payload,
-                timeout=120
-            )
-            response.raise_for_status()
-            
-            result = response.json()
-            analysis_report = result['choices'][0]['message']['content']
-            
-            return analysis_report
-            
-        except requests.exceptions.RequestException as e:
-            raise Exception(f"Error calling OpenRouter API: {str(e)}")
-    
-    def analyze_and_save(self, ticker: str, data_dir: str, output_dir: Optional[str] = None) -> str:
-        """
-        Analyze a ticker and save the report to a file
-        
-        Args:
-            ticker: Stock ticker symbol
-            data_dir: Path to the data directory
-            output_dir: Directory to save the report. If None, saves in data/output/{timestamp}/analyst/institutional
-            
-        Returns:
-            Path to the saved report file
-        """
-        # Perform analysis
-        report = self.analyze(ticker, data_dir)
-        
-        # Determine output path
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
-        if output_dir is None:
-            # Save in data/output/{timestamp}/analyst/institutional/
-            base_path = Path(data_dir).parent  # Go up from ticker folder to data/raw parent
-            if base_path.name == 'raw':
-                base_path = base_path.parent  # Go up one more level to data/
-            output_dir = base_path / "output" / timestamp / "analyst" / "institutional"
-        else:
-            output_dir = Path(output_dir)
-        
-        output_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Save report
-        output_file = output_dir / f"{ticker}_institutional_analysis_{timestamp}.md"
-        
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(f"# Institutional & Insider Activity Analysis Report: {ticker}\n")
-            f.write(f"Generated: {datetime.now().strftime('%B %d, %Y at %I:%M %p')}\n\n")
-            f.write("---\n\n")
-            f.write(report)
-        
-        print(f"Report saved to: {output_file}")
-        return str(output_file)
 
 
 def main():
@@ -8,37 +8,65 @@ This module analyzes news and events data including:
 """
 
 import os
-import json
-import requests
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Optional, Any, List
+from typing import Dict, Any, List, Optional, Set, Tuple
+from src.analyst._io import load_json
+from src.analyst.base import BaseAnalyst
 
 
-class NewsAnalyst:
+class NewsAnalyst(BaseAnalyst):
     """Analyzes news, events, and narratives using AI"""
     
-    def __init__(self, api_key: Optional[str] = None):
-        """
-        Initialize the News Analyst
-        
-        Args:
-            api_key: OpenRouter API key. If None, will try to get from environment variable OPENROUTER_API_KEY
-        """
-        self.api_key = api_key or os.environ.get('OPENROUTER_API_KEY')
-        if not self.api_key:
-            raise ValueError("OpenRouter API key must be provided or set in OPENROUTER_API_KEY environment variable")
-        
-        self.api_url = "https://openrouter.ai/api/v1/chat/completions"
-        self.model = "xiaomi/mimo-v2-flash:free"
-        
-    def load_data(self, ticker: str, data_dir: str) -> Dict[str, Any]:
+    SECTION_NAME = "news"
+    REPORT_TITLE = "News & Narrative Analysis Report"
+    LOADING_MESSAGE = "Loading news data for {ticker}..."
+    ANALYZING_MESSAGE = "Analyzing news for {ticker} using AI..."
+    
+    # Cap on the formatted data (~8k tokens); lower-priority sections are dropped past it.
+    # Characters rather than UTF-8 bytes, since the cap stands in for a token budget
+    MAX_PROMPT_CHARS = 24_000
+    # Characters of article content kept in each preview
+    PREVIEW_CHARS = 500
+    # Stock-specific articles kept for the prompt
+    MAX_ARTICLES = 20
+    
+    SYSTEM_MESSAGE = (
+        "You are a financial analyst specializing in news analysis and market narratives. "
+        "Your task is to analyze news articles, upcoming events, and global context to identify "
+        "catalysts, sentiment, and potential market-moving narratives for traders and investors. "
+        "Provide detailed analysis with actionable insights. Look for themes, sentiment trends, "
+        "and connections between company-specific news and broader market conditions. "
+        "Do not simply summarize headlines - provide deep analysis of implications and potential impacts. "
+        "Make sure to append a Markdown table at the end summarizing key catalysts, sentiment, and timing."
+        "\n\nProvide a comprehensive news and narrative analysis report that includes:\n"
+        "1. Upcoming Catalysts & Events (earnings, dividends, key dates)\n"
+        "2. Stock-Specific News Analysis (sentiment, themes, key stories)\n"
+        "3. Global News Context (relevant macro trends, geopolitical factors)\n"
+        "4. Market Sentiment Assessment (bullish, bearish, neutral indicators)\n"
+        "5. Key Narratives & Themes (what stories are driving discussion)\n"
+        "6. Potential Impact on Stock Price (near-term and medium-term)\n"
+        "7. Risk Factors & Watch Points\n"
+        "8. Summary table with key catalysts, sentiment signals, and timing"
+    )
+    
+    USER_PROMPT_TEMPLATE = (
+        "Current Date: {current_date}\n"
+        "Company Ticker: {ticker}\n\n"
+        "Please analyze the following news and events data:\n\n"
+        "{formatted_data}\n"
+    )
+    
+    def load_data(self, ticker: str, data_dir: str, include: Optional[Set[str]] = None,
+                  max_articles: Optional[int] = None) -> Dict[str, Any]:
         """
         Load all news and event data for a given ticker
         
         Args:
             ticker: Stock ticker symbol (e.g., 'AAPL')
             data_dir: Path to the data directory containing ticker folders
+            include: Data keys to load ('global_news', 'stock_news', 'upcoming_events'). If None, loads all of them
+            max_articles: Stock-specific articles to keep. If None, uses MAX_ARTICLES
             
         Returns:
             Dictionary containing all loaded news data
@@ -55,26 +83,51 @@ class NewsAnalyst:
             'collection_date': data_path.name if data_path.name.isdigit() else None
         }
         
-        # Load Global News
-        global_news_path = data_path / "global_news.json"
-        if global_news_path.exists():
-            with open(global_news_path, 'r', encoding='utf-8') as f:
-                data['global_news'] = json.load(f)
+        # Global news sits next to the ticker folders, so only part of this can go through load_files
+        jobs = [
+            ('global_news', data_path / "global_news.json"),
+            ('stock_news', ticker_path / "yfinance_News.json"),
+            ('upcoming_events', ticker_path / "yfinance_UpcommingEvents.json"),
+        ]
+        jobs = [(key, path) for key, path in jobs if (include is None or key in include) and path.exists()]
         
-        # Load Stock-Specific News
-        stock_news_path = ticker_path / "yfinance_News.json"
-        if stock_news_path.exists():
-            with open(stock_news_path, 'r', encoding='utf-8') as f:
-                data['stock_news'] = json.load(f)
+        # Read the files concurrently so their disk waits overlap
+        if jobs:
+            with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+                futures = [(key, executor.submit(load_json, path)) for key, path in jobs]
+                data.update((key, future.result()) for key, future in futures)
         
-        # Load Upcoming Events
-        upcoming_events_path = ticker_path / "yfinance_UpcommingEvents.json"
-        if upcoming_events_path.exists():
-            with open(upcoming_events_path, 'r', encoding='utf-8') as f:
-                data['upcoming_events'] = json.load(f)
+        # Only the first articles reach the prompt, so drop the rest before they are cached
+        if max_articles is None:
+            max_articles = self.MAX_ARTICLES
+        articles = data.get('stock_news', {}).get('articles')
+        if articles:
+            # Syndicated stories show up once per source; keep the first copy
+            articles = data['stock_news']['articles'] = self._unique_by_title(articles)
+        if articles and len(articles) > max_articles:
+            data['stock_news']['articles'] = articles[:max_articles]
+            data['stock_news']['omitted_articles'] = len(articles) - max_articles
         
         return data
     
+    def _data_fingerprint(self, ticker_path: Path) -> Tuple:
+        """
+        Summarize the input files, including the shared global news file next to the ticker folders
+        
+        Args:
+            ticker_path: Folder holding the ticker's data files
+            
+        Returns:
+            Fingerprint of the ticker folder and global_news.json
+        """
+        global_news_path = ticker_path.parent / "global_news.json"
+        try:
+            stat = os.stat(global_news_path)
+            global_news = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            global_news = None
+        return super()._data_fingerprint(ticker_path) + (('global_news.json', global_news),)
+    
     def format_data_for_prompt(self, data: Dict[str, Any]) -> str:
         """
         Format loaded news data into a readable string for the AI prompt
@@ -124,6 +177,10 @@ class NewsAnalyst:
             
             sections.append("")
         
+        # Sections run in priority order (events > stock news > global news); stop once over budget
+        if self._over_budget(sections):
+            return self._truncated(sections)
+        
         # Stock-Specific News
         if 'stock_news' in data:
             sections.append("## Stock-Specific News")
@@ -134,24 +191,19 @@ class NewsAnalyst:
             
             if 'articles' in news_data and news_data['articles']:
                 sections.append("### Recent Articles:\n")
-                # Limit to first 20 articles to keep prompt manageable
-                for i, article in enumerate(news_data['articles'][:20], 1):
-                    sections.append(f"**{i}. {article.get('title', 'No title')}**")
-                    sections.append(f"   - Source: {article.get('source', 'Unknown')}")
-                    sections.append(f"   - Time: {article.get('time', 'N/A')}")
-                    
-                    # Add content preview if available
-                    if article.get('content'):
-                        content = article['content']
-                        # Truncate long content
-                        if len(content) > 500:
-                            content = content[:500] + "..."
-                        sections.append(f"   - Preview: {content}")
-                    
-                    sections.append("")
+                # Limit to the first MAX_ARTICLES articles to keep prompt manageable
+                articles = news_data['articles']
+                sections.append("\n\n".join(
+                    self._format_article(i, article) for i, article in enumerate(articles[:self.MAX_ARTICLES], 1)
+                ))
+                sections.append("")
                 
-                if len(news_data['articles']) > 20:
-                    sections.append(f"... and {len(news_data['articles']) - 20} more articles\n")
+                omitted = news_data.get('omitted_articles', 0) + max(len(articles) - self.MAX_ARTICLES, 0)
+                if omitted:
+                    sections.append(f"... and {omitted} more articles\n")
+        
+        if self._over_budget(sections):
+            return self._truncated(sections)
         
         # Global News
         if 'global_news' in data:
@@ -169,146 +221,84 @@ class NewsAnalyst:
                 # US News
                 if 'US_News' in news_categories:
                     sections.append("### US News Headlines (Sample):")
-                    us_news = news_categories['US_News'][:15]  # First 15 headlines
-                    for i, article in enumerate(us_news, 1):
-                        sections.append(f"{i}. {article.get('title', 'No title')} - {article.get('source', 'Unknown')} ({article.get('date', 'N/A')})")
+                    us_news = self._unique_by_title(news_categories['US_News'])[:15]  # First 15 distinct headlines
+                    sections.append("\n".join(self._format_headline(i, article) for i, article in enumerate(us_news, 1)))
                     sections.append("")
                 
+                if self._over_budget(sections):
+                    return self._truncated(sections)
+                
                 # World News
                 if 'World_News' in news_categories:
                     sections.append("### World News Headlines (Sample):")
-                    world_news = news_categories['World_News'][:15]  # First 15 headlines
-                    for i, article in enumerate(world_news, 1):
-                        sections.append(f"{i}. {article.get('title', 'No title')} - {article.get('source', 'Unknown')} ({article.get('date', 'N/A')})")
+                    world_news = self._unique_by_title(news_categories['World_News'])[:15]  # First 15 distinct headlines
+                    sections.append("\n".join(self._format_headline(i, article) for i, article in enumerate(world_news, 1)))
                     sections.append("")
         
+        if self._over_budget(sections):
+            return self._truncated(sections)
         return "\n".join(sections)
     
-    def analyze(self, ticker: str, data_dir: str) -> str:
-        """
-        Perform news and narrative analysis on a given ticker
-        
-        Args:
-            ticker: Stock ticker symbol
-            data_dir: Path to the data directory
-            
-        Returns:
-            Comprehensive news analysis report
-        """
-        # Load data
-        print(f"Loading news data for {ticker}...")
-        data = self.load_data(ticker, data_dir)
-        
-        # Format data for prompt
-        formatted_data = self.format_data_for_prompt(data)
-        
-        # Prepare the prompt
-        current_date = datetime.now().strftime("%B %d, %Y")
-        
-        system_message = (
-            "You are a financial analyst specializing in news analysis and market narratives. "
-            "Your task is to analyze news articles, upcoming events, and global context to identify "
-            "catalysts, sentiment, and potential market-moving narratives for traders and investors. "
-            "Provide detailed analysis with actionable insights. Look for themes, sentiment trends, "
-            "and connections between company-specific news and broader market conditions. "
-            "Do not simply summarize headlines - provide deep analysis of implications and potential impacts. "
-            "Make sure to append a Markdown table at the end summarizing key catalysts, sentiment, and timing."
-        )
-        
-        user_message = (
-            f"Current Date: {current_date}\n"
-            f"Company Ticker: {ticker}\n\n"
-            f"Please analyze the following news and events data:\n\n"
-            f"{formatted_data}\n\n"
-            f"Provide a comprehensive news and narrative analysis report that includes:\n"
-            f"1. Upcoming Catalysts & Events (earnings, dividends, key dates)\n"
-            f"2. Stock-Specific News Analysis (sentiment, themes, key stories)\n"
-            f"3. Global News Context (relevant macro trends, geopolitical factors)\n"
-            f"4. Market Sentiment Assessment (bullish, bearish, neutral indicators)\n"
-            f"5. Key Narratives & Themes (what stories are driving discussion)\n"
-            f"6. Potential Impact on Stock Price (near-term and medium-term)\n"
-            f"7. Risk Factors & Watch Points\n"
-            f"8. Summary table with key catalysts, sentiment signals, and timing\n"
-        )
-        
-        # Call OpenRouter API
-        print(f"Analyzing news for {ticker} using AI...")
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
-        
-        payload = {
-            "model": self.model,
-            "messages": [
-                {
-                    "role": "system",
-                    "content": system_message
-                },
-                {
-                    "role": "user",
-                    "content": user_message
-                }
-            ]
-        }
-        
-        try:
-            response = requests.post(
-                self.api_url,
-                headers=headers,
-                json=payload,
-                timeout=120
-            )
-            response.raise_for_status()
-            
-            result = response.json()
-            analysis_report = result['choices'][0]['message']['content']
-            
-            return analysis_report
-            
-        except requests.exceptions.RequestException as e:
-            raise Exception(f"Error calling OpenRouter API: {str(e)}")
+    def _over_budget(self, sections: List[str]) -> bool:
+        """Check whether the sections built so far, joined by newlines, exceed MAX_PROMPT_CHARS"""
+        # Same length as "\n".join(sections), without building the string
+        return sum(map(len, sections)) + max(len(sections) - 1, 0) > self.MAX_PROMPT_CHARS
     
-    def analyze_and_save(self, ticker: str, data_dir: str, output_dir: Optional[str] = None) -> str:
+    def _truncated(self, sections: List[str]) -> str:
         """
-        Analyze ticker news and save the report to a file
+        Join the sections built so far, cut at the last whole line that fits MAX_PROMPT_CHARS
         
         Args:
-            ticker: Stock ticker symbol
-            data_dir: Path to the data directory
-            output_dir: Directory to save the report. If None, saves in data/output/{timestamp}/analyst/news
+            sections: Sections built so far; the last one may cross the budget
             
         Returns:
-            Path to the saved report file
+            Formatted data ending with a note that the rest was left out
         """
-        # Perform analysis
-        report = self.analyze(ticker, data_dir)
-        
-        # Determine output path
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
-        if output_dir is None:
-            # Save in data/output/{timestamp}/analyst/news/
-            base_path = Path(data_dir).parent  # Go up from ticker folder to data/raw parent
-            if base_path.name == 'raw':
-                base_path = base_path.parent  # Go up one more level to data/
-            output_dir = base_path / "output" / timestamp / "analyst" / "news"
-        else:
-            output_dir = Path(output_dir)
-        
-        output_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Save report
-        output_file = output_dir / f"{ticker}_news_analysis_{timestamp}.md"
+        note = "*Remaining news data omitted to keep the prompt within budget.*"
+        text = "\n".join(sections)
+        # Keep room for the note so the result stays within the budget
+        limit = self.MAX_PROMPT_CHARS - len(note) - 1
+        if len(text) > limit:
+            text = text[:limit]
+            if "\n" in text:
+                text = text[:text.rindex("\n")]
+        return f"{text}\n{note}"
+    
+    @staticmethod
+    def _unique_by_title(articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Drop articles whose title (ignoring case and surrounding whitespace) was already seen"""
+        seen = set()
+        unique = []
+        for article in articles:
+            title = (article.get('title') or '').strip().casefold()
+            if title and title in seen:
+                continue
+            seen.add(title)
+            unique.append(article)
+        return unique
+    
+    @classmethod
+    def _format_article(cls, index: int, article: Dict[str, Any]) -> str:
+        """Render one stock-specific article as a numbered block"""
+        lines = [
+            f"**{index}. {article.get('title', 'No title')}**",
+            f"   - Source: {article.get('source', 'Unknown')}",
+            f"   - Time: {article.get('time', 'N/A')}",
+        ]
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(f"# News & Narrative Analysis Report: {ticker}\n")
-            f.write(f"Generated: {datetime.now().strftime('%B %d, %Y at %I:%M %p')}\n\n")
-            f.write("---\n\n")
-            f.write(report)
+        # Add content preview if available, truncating long content
+        content = article.get('content')
+        if content:
+            if len(content) > cls.PREVIEW_CHARS:
+                content = content[:cls.PREVIEW_CHARS] + "..."
+            lines.append(f"   - Preview: {content}")
         
-        print(f"Report saved to: {output_file}")
-        return str(output_file)
+        return "\n".join(lines)
+    
+    @staticmethod
+    def _format_headline(index: int, article: Dict[str, Any]) -> str:
+        """Render one global news headline as a numbered line"""
+        return f"{index}. {article.get('title', 'No title')} - {article.get('source', 'Unknown')} ({article.get('date', 'N/A')})"
 
 
 def main():
@@ -10,31 +10,107 @@ This module analyzes options data including:
 """
 
 import os
-import json
+import numpy as np
 import pandas as pd
-import requests
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Optional, Any
+from typing import Dict, Optional, Any, Tuple
+from src.analyst._io import read_csv, read_csv_cached, load_json
+from src.analyst.base import BaseAnalyst, frame_to_prompt
 
+# File name prefixes of the per-expiry Finviz option chains
+_CALL_PREFIX = "finviz_OptionChainCall_"
+_PUT_PREFIX = "finviz_OptionChainPut_"
 
-class OptionAnalyst:
+# Banner opening each expiry's block in the prompt
+_DIVIDER = "=" * 80
+_EXPIRY_HEADER = f"{_DIVIDER}\n## Expiry: %s\n{_DIVIDER}\n"
+
+# Mapping from various formats to standardized names
+_COLUMN_MAPPING = {
+    'Strike': 'strike',
+    'OpenInt': 'openInterest',
+    'IV': 'impliedVolatility',
+    'Bid': 'bid',
+    'Ask': 'ask',
+    'Last': 'last',
+    'Change': 'change',
+    'Delta': 'delta',
+    'Gamma': 'gamma',
+    'Theta': 'theta',
+    'Vega': 'vega',
+    'Rho': 'rho'
+}
+
+
+def _max_pain_strike(strikes: np.ndarray, call_oi: np.ndarray, put_oi: np.ndarray) -> float:
+    """
+    Find the max pain strike of one expiry
+    
+    Args:
+        strikes: Sorted strike prices
+        call_oi: Call open interest at each strike
+        put_oi: Put open interest at each strike
+        
+    Returns:
+        Strike at which expiring options pay out the least in total
+    """
+    # moneyness[i, k] = strikes[i] - strikes[k]: calls at strike k pay out above it, puts below it
+    moneyness = strikes[:, None] - strikes[None, :]
+    payout = np.maximum(moneyness, 0.0) @ call_oi + np.maximum(-moneyness, 0.0) @ put_oi
+    return strikes[int(payout.argmin())]
+
+
+class OptionAnalyst(BaseAnalyst):
     """Analyzes options chain data using AI"""
     
-    def __init__(self, api_key: Optional[str] = None):
+    SECTION_NAME = "option"
+    REPORT_TITLE = "Options Chain Analysis Report"
+    LOADING_MESSAGE = "Loading options data for {ticker}..."
+    ANALYZING_MESSAGE = "Analyzing options for {ticker} using AI..."
+    
+    SYSTEM_MESSAGE = (
+        "You are a financial analyst specializing in options trading and derivatives analysis. "
+        "Your task is to analyze options chain data to identify market sentiment, key support/resistance levels, "
+        "unusual options activity, and potential trading opportunities. Provide detailed analysis with actionable insights. "
+        "Consider implied volatility patterns, put/call ratios, open interest concentrations, and volume patterns. "
+        "Identify potential hedging activity, directional bets, and market maker positioning. "
+        "Do not simply describe the data - provide deep analysis of implications for price action and trader positioning. "
+        "Make sure to append a Markdown table at the end summarizing key findings, strike levels, and sentiment indicators."
+        "\n\nProvide a comprehensive options analysis report that includes:\n"
+        "1. Options Flow Overview (volume, open interest, put/call ratios for each expiry)\n"
+        "2. Market Sentiment Analysis (bullish/bearish signals from options activity across expiries)\n"
+        "3. Key Strike Levels Analysis (support/resistance, max pain for each expiry)\n"
+        "4. Implied Volatility Analysis (IV patterns and term structure across expiries)\n"
+        "5. Unusual Options Activity (significant positions, large orders by expiry)\n"
+        "6. Institutional Positioning Insights (hedging vs. directional bets, calendar spreads)\n"
+        "7. Term Structure Analysis (how sentiment differs between near-term and longer-term expiries)\n"
+        "8. Potential Price Targets and Key Levels to Watch\n"
+        "9. Trading Implications and Strategy Considerations (including multi-leg strategies)\n"
+        "10. Summary table with key metrics, strike levels, and sentiment signals for each expiry"
+    )
+    
+    USER_PROMPT_TEMPLATE = (
+        "Current Date: {current_date}\n"
+        "Company Ticker: {ticker}\n\n"
+        "Please analyze the following options chain data for MULTIPLE EXPIRY DATES:\n\n"
+        "{formatted_data}\n"
+    )
+    
+    def __init__(self, api_key: Optional[str] = None, use_cache: bool = True, max_rows_in_prompt: int = 50,
+                 **kwargs):
         """
         Initialize the Option Analyst
         
         Args:
             api_key: OpenRouter API key. If None, will try to get from environment variable OPENROUTER_API_KEY
+            use_cache: Reuse loaded data and AI reports, and keep Arrow copies of the option chain CSVs
+            max_rows_in_prompt: Strikes per chain listed in the prompt, keeping those with the highest open interest
+            **kwargs: Other BaseAnalyst options (cache_dir, cache_ttl, enable_prompt_cache, fallback_model)
         """
-        self.api_key = api_key or os.environ.get('OPENROUTER_API_KEY')
-        if not self.api_key:
-            raise ValueError("OpenRouter API key must be provided or set in OPENROUTER_API_KEY environment variable")
-        
-        self.api_url = "https://openrouter.ai/api/v1/chat/completions"
-        self.model = "xiaomi/mimo-v2-flash:free"
-        
+        super().__init__(api_key=api_key, use_cache=use_cache, **kwargs)
+        self.max_rows_in_prompt = max_rows_in_prompt
+    
     def load_data(self, ticker: str, data_dir: str) -> Dict[str, Any]:
         """
         Load all options data for a given ticker
@@ -57,41 +133,28 @@ class OptionAnalyst:
             'expiries': {}
         }
         
-        # Find all Finviz option chain files
-        call_files = sorted(ticker_path.glob("finviz_OptionChainCall_*.csv"))
-        put_files = sorted(ticker_path.glob("finviz_OptionChainPut_*.csv"))
-        
-        # Extract expiry dates from filenames
-        expiries = set()
-        for f in call_files:
-            # Extract date from filename like finviz_OptionChainCall_2026-01-09.csv
-            expiry = f.stem.replace("finviz_OptionChainCall_", "")
-            expiries.add(expiry)
-        
-        # Load options for each expiry
-        for expiry in sorted(expiries):
-            call_path = ticker_path / f"finviz_OptionChainCall_{expiry}.csv"
-            put_path = ticker_path / f"finviz_OptionChainPut_{expiry}.csv"
-            
-            expiry_data = {'expiry': expiry}
-            
-            # Load call options
-            if call_path.exists():
-                df = pd.read_csv(call_path)
-                # Normalize column names (Finviz uses different naming)
-                df = self._normalize_columns(df)
-                expiry_data['call_options_df'] = df
-                expiry_data['call_options'] = df.to_dict('records')
-            
-            # Load put options
-            if put_path.exists():
-                df = pd.read_csv(put_path)
-                # Normalize column names
-                df = self._normalize_columns(df)
-                expiry_data['put_options_df'] = df
-                expiry_data['put_options'] = df.to_dict('records')
-            
-            data['expiries'][expiry] = expiry_data
+        # Find all Finviz option chain files in one directory pass,
+        # taking the expiry from names like finviz_OptionChainCall_2026-01-09.csv
+        call_files = {}
+        put_files = {}
+        with os.scandir(ticker_path) as entries:
+            for entry in entries:
+                name = entry.name
+                if not name.endswith(".csv"):
+                    continue
+                if name.startswith(_CALL_PREFIX):
+                    call_files[name[len(_CALL_PREFIX):-4]] = Path(entry.path)
+                elif name.startswith(_PUT_PREFIX):
+                    put_files[name[len(_PUT_PREFIX):-4]] = Path(entry.path)
+        expiries = sorted(call_files.keys() | put_files.keys())
+        
+        # Load options for each expiry; expiries are independent, so read them concurrently.
+        # executor.map keeps the sorted order, which format_data_for_prompt relies on
+        if expiries:
+            with ThreadPoolExecutor(max_workers=min(8, len(expiries))) as executor:
+                loaded = executor.map(lambda e: self._load_expiry(e, call_files.get(e), put_files.get(e)), expiries)
+                for expiry, expiry_data in loaded:
+                    data['expiries'][expiry] = expiry_data
         
         # If no Finviz data found, try legacy yfinance format
         if not data['expiries']:
@@ -102,28 +165,76 @@ class OptionAnalyst:
                 expiry_data = {'expiry': 'unknown'}
                 
                 if call_options_path.exists():
-                    df = pd.read_csv(call_options_path, index_col=0)
-                    df = self._normalize_columns(df)
-                    expiry_data['call_options_df'] = df
-                    expiry_data['call_options'] = df.to_dict('records')
+                    self._add_chain(expiry_data, 'call', read_csv(call_options_path, index_col=0))
                 
                 if put_options_path.exists():
-                    df = pd.read_csv(put_options_path, index_col=0)
-                    df = self._normalize_columns(df)
-                    expiry_data['put_options_df'] = df
-                    expiry_data['put_options'] = df.to_dict('records')
+                    self._add_chain(expiry_data, 'put', read_csv(put_options_path, index_col=0))
                 
                 data['expiries']['unknown'] = expiry_data
         
         # Load Ticker Info for current price context
         ticker_info_path = ticker_path / "yfinance_TickerInfo.json"
         if ticker_info_path.exists():
-            with open(ticker_info_path, 'r') as f:
-                ticker_info = json.load(f)
-                data['current_price'] = ticker_info.get('currentPrice', ticker_info.get('regularMarketPrice', 'N/A'))
+            ticker_info = load_json(ticker_info_path)
+            data['current_price'] = ticker_info.get('currentPrice', ticker_info.get('regularMarketPrice', 'N/A'))
         
         return data
     
+    def _load_expiry(self, expiry: str, call_path: Optional[Path],
+                     put_path: Optional[Path]) -> Tuple[str, Dict[str, Any]]:
+        """
+        Load the call and put chains of one Finviz expiry
+        
+        Args:
+            expiry: Expiry date as it appears in the file names (YYYY-MM-DD)
+            call_path: Call chain CSV, or None if there is none for this expiry
+            put_path: Put chain CSV, or None if there is none for this expiry
+            
+        Returns:
+            Tuple of (expiry, expiry data with call/put_options_df and call/put_active_df)
+        """
+        expiry_data = {'expiry': expiry}
+        
+        # Load call options
+        if call_path is not None:
+            self._add_chain(expiry_data, 'call', self._read_chain(call_path))
+        
+        # Load put options
+        if put_path is not None:
+            self._add_chain(expiry_data, 'put', self._read_chain(put_path))
+        
+        return expiry, expiry_data
+    
+    def _add_chain(self, expiry_data: Dict[str, Any], side: str, df: pd.DataFrame) -> None:
+        """
+        Normalize a loaded chain and store it with its strikes that have open interest
+        
+        Args:
+            expiry_data: Expiry entry to fill
+            side: 'call' or 'put'
+            df: Chain as read from disk
+        """
+        # Normalize column names (Finviz uses different naming)
+        df = self._normalize_columns(df)
+        expiry_data[f'{side}_options_df'] = df
+        # Filtered once here so the cached data already holds the rows the prompt lists
+        # A blank OpenInt cell compares as missing rather than False, so treat it as no open interest
+        expiry_data[f'{side}_active_df'] = df[(df['openInterest'] > 0).fillna(False)]
+    
+    def _read_chain(self, path: Path) -> pd.DataFrame:
+        """
+        Read one Finviz option chain CSV, through an Arrow sidecar in the cache directory when caching is enabled
+        
+        Args:
+            path: Path to the option chain CSV
+            
+        Returns:
+            DataFrame with the raw Finviz columns
+        """
+        if self.use_cache:
+            return read_csv_cached(path, self.cache_dir / "arrow")
+        return read_csv(path)
+    
     def _normalize_columns(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Normalize column names from different data sources
@@ -134,24 +245,12 @@ class OptionAnalyst:
         Returns:
             DataFrame with normalized column names
         """
-        # Mapping from various formats to standardized names
-        column_mapping = {
-            'Strike': 'strike',
-            'OpenInt': 'openInterest',
-            'IV': 'impliedVolatility',
-            'Bid': 'bid',
-            'Ask': 'ask',
-            'Last': 'last',
-            'Change': 'change',
-            'Delta': 'delta',
-            'Gamma': 'gamma',
-            'Theta': 'theta',
-            'Vega': 'vega',
-            'Rho': 'rho'
-        }
+        # Already normalized (e.g. yfinance files): nothing to rename
+        if _COLUMN_MAPPING.keys().isdisjoint(df.columns):
+            return df
         
-        # Rename columns if they exist
-        df = df.rename(columns=column_mapping)
+        # Rename columns if they exist; the frame was just loaded, so relabel it in place instead of copying
+        df.columns = [_COLUMN_MAPPING.get(column, column) for column in df.columns]
         
         return df
     
@@ -175,35 +274,52 @@ class OptionAnalyst:
                     call_df = expiry_data['call_options_df']
                     put_df = expiry_data['put_options_df']
                     
+                    # Open interest per strike for both sides in one groupby (columns: 0 = calls, 1 = puts)
+                    combined = pd.concat([
+                        call_df[['strike', 'openInterest']].assign(side=0),
+                        put_df[['strike', 'openInterest']].assign(side=1)
+                    ], ignore_index=True)
+                    oi_by_strike = (
+                        combined.groupby(['strike', 'side'])['openInterest'].sum()
+                        .unstack('side', fill_value=0)
+                        .reindex(columns=[0, 1], fill_value=0)
+                    )
+                    # Plain NumPy arrays from here on; the grouped sums contain no missing values
+                    call_oi = oi_by_strike[0].to_numpy()
+                    put_oi = oi_by_strike[1].to_numpy()
+                    
                     # Total open interest
-                    metrics['total_call_oi'] = call_df['openInterest'].sum()
-                    metrics['total_put_oi'] = put_df['openInterest'].sum()
+                    metrics['total_call_oi'] = call_oi.sum()
+                    metrics['total_put_oi'] = put_oi.sum()
                     
                     # Put/Call ratios
                     if metrics['total_call_oi'] > 0:
                         metrics['put_call_oi_ratio'] = metrics['total_put_oi'] / metrics['total_call_oi']
                     
                     # Max open interest strikes
-                    if len(call_df[call_df['openInterest'] > 0]) > 0:
-                        metrics['max_call_oi_strike'] = call_df.loc[call_df['openInterest'].idxmax(), 'strike']
-                    if len(put_df[put_df['openInterest'] > 0]) > 0:
-                        metrics['max_put_oi_strike'] = put_df.loc[put_df['openInterest'].idxmax(), 'strike']
+                    if np.count_nonzero(call_oi > 0):
+                        metrics['max_call_oi_strike'] = oi_by_strike.index[int(call_oi.argmax())]
+                    if np.count_nonzero(put_oi > 0):
+                        metrics['max_put_oi_strike'] = oi_by_strike.index[int(put_oi.argmax())]
                     
-                    # Implied volatility stats
-                    call_iv_valid = call_df[call_df['impliedVolatility'] > 0.01]['impliedVolatility']
-                    put_iv_valid = put_df[put_df['impliedVolatility'] > 0.01]['impliedVolatility']
+                    # Implied volatility stats (missing values compare False and drop out of the mask)
+                    call_iv = call_df['impliedVolatility'].to_numpy(dtype=float, na_value=np.nan)
+                    put_iv = put_df['impliedVolatility'].to_numpy(dtype=float, na_value=np.nan)
+                    call_iv_valid = call_iv > 0.01
+                    put_iv_valid = put_iv > 0.01
                     
-                    if len(call_iv_valid) > 0:
-                        metrics['avg_call_iv'] = call_iv_valid.mean()
-                    if len(put_iv_valid) > 0:
-                        metrics['avg_put_iv'] = put_iv_valid.mean()
+                    if call_iv_valid.any():
+                        metrics['avg_call_iv'] = call_iv[call_iv_valid].mean()
+                    if put_iv_valid.any():
+                        metrics['avg_put_iv'] = put_iv[put_iv_valid].mean()
                     
-                    # Max pain calculation (simplified - strike with max total OI)
-                    call_oi_by_strike = call_df.groupby('strike')['openInterest'].sum()
-                    put_oi_by_strike = put_df.groupby('strike')['openInterest'].sum()
-                    total_oi_by_strike = call_oi_by_strike.add(put_oi_by_strike, fill_value=0)
-                    if len(total_oi_by_strike) > 0:
-                        metrics['max_pain_strike'] = total_oi_by_strike.idxmax()
+                    # Max pain: expiry price (among listed strikes) that minimizes the option holders' payout
+                    if len(oi_by_strike) > 0:
+                        metrics['max_pain_strike'] = _max_pain_strike(
+                            oi_by_strike.index.to_numpy(dtype=float),
+                            call_oi.astype(float),
+                            put_oi.astype(float)
+                        )
                 
                 all_metrics[expiry] = metrics
         
@@ -234,20 +350,17 @@ class OptionAnalyst:
         # Display data for each expiry
         if 'expiries' in data:
             sections.append(f"**Available Expiries:** {len(data['expiries'])}")
-            sections.append(f"**Expiry Dates:** {', '.join(sorted(data['expiries'].keys()))}\n")
+            # load_data inserts expiries in date order, so no sorting is needed here
+            sections.append(f"**Expiry Dates:** {', '.join(data['expiries'])}\n")
             
-            for expiry in sorted(data['expiries'].keys()):
-                expiry_data = data['expiries'][expiry]
+            for expiry, expiry_data in data['expiries'].items():
                 metrics = all_metrics.get(expiry, {})
                 
-                sections.append("=" * 80)
-                sections.append(f"## Expiry: {expiry}")
-                sections.append("=" * 80)
-                sections.append("")
+                sections.append(_EXPIRY_HEADER % expiry)
                 
                 # Options Flow Metrics Summary for this expiry
                 sections.append("### Options Flow Metrics Summary")
-
+                
                 if 'total_call_oi' in metrics:
                     sections.append(f"\n**Total Call Open Interest:** {metrics['total_call_oi']:,.0f}")
                     sections.append(f"**Total Put Open Interest:** {metrics['total_put_oi']:,.0f}")
@@ -267,15 +380,14 @@ class OptionAnalyst:
                 # Call Options Chain
                 if 'call_options_df' in expiry_data:
                     sections.append("### Call Options Chain")
-                    call_df = expiry_data['call_options_df']
                     
                     # Show strikes with significant activity
-                    significant_calls = call_df[(call_df['openInterest'] > 0)].copy()
+                    significant_calls = expiry_data['call_active_df']
                     
                     if len(significant_calls) > 0:
                         sections.append(f"**Total Strikes with Activity:** {len(significant_calls)}\n")
-                        sections.append("**Strikes with Significant Activity (OI > 0):**")
-                        sections.append(significant_calls.to_string())
+                        sections.append(self._significant_label(len(significant_calls)))
+                        sections.append(self._top_strikes(significant_calls))
                     else:
                         sections.append("No significant activity found in call options.")
                     
@@ -284,15 +396,14 @@ class OptionAnalyst:
                 # Put Options Chain
                 if 'put_options_df' in expiry_data:
                     sections.append("### Put Options Chain")
-                    put_df = expiry_data['put_options_df']
                     
                     # Show strikes with significant activity
-                    significant_puts = put_df[(put_df['openInterest'] > 0)].copy()
+                    significant_puts = expiry_data['put_active_df']
                     
                     if len(significant_puts) > 0:
                         sections.append(f"**Total Strikes with Activity:** {len(significant_puts)}\n")
-                        sections.append("**Strikes with Significant Activity (OI > 0):**")
-                        sections.append(significant_puts.to_string())
+                        sections.append(self._significant_label(len(significant_puts)))
+                        sections.append(self._top_strikes(significant_puts))
                     else:
                         sections.append("No significant activity found in put options.")
                     
@@ -309,133 +420,25 @@ class OptionAnalyst:
         
         return "\n".join(sections)
     
-    def analyze(self, ticker: str, data_dir: str) -> str:
-        """
-        Perform options chain analysis on a given ticker
-        
-        Args:
-            ticker: Stock ticker symbol
-            data_dir: Path to the data directory
-            
-        Returns:
-            Comprehensive options analysis report
-        """
-        # Load data
-        print(f"Loading options data for {ticker}...")
-        data = self.load_data(ticker, data_dir)
-        
-        # Format data for prompt
-        formatted_data = self.format_data_for_prompt(data)
-        
-        # Prepare the prompt
-        current_date = datetime.now().strftime("%B %d, %Y")
-        
-        system_message = (
-            "You are a financial analyst specializing in options trading and derivatives analysis. "
-            "Your task is to analyze options chain data to identify market sentiment, key support/resistance levels, "
-            "unusual options activity, and potential trading opportunities. Provide detailed analysis with actionable insights. "
-            "Consider implied volatility patterns, put/call ratios, open interest concentrations, and volume patterns. "
-            "Identify potential hedging activity, directional bets, and market maker positioning. "
-            "Do not simply describe the data - provide deep analysis of implications for price action and trader positioning. "
-            "Make sure to append a Markdown table at the end summarizing key findings, strike levels, and sentiment indicators."
-        )
-        
-        user_message = (
-            f"Current Date: {current_date}\n"
-            f"Company Ticker: {ticker}\n\n"
-            f"Please analyze the following options chain data for MULTIPLE EXPIRY DATES:\n\n"
-            f"{formatted_data}\n\n"
-            f"Provide a comprehensive options analysis report that includes:\n"
-            f"1. Options Flow Overview (volume, open interest, put/call ratios for each expiry)\n"
-            f"2. Market Sentiment Analysis (bullish/bearish signals from options activity across expiries)\n"
-            f"3. Key Strike Levels Analysis (support/resistance, max pain for each expiry)\n"
-            f"4. Implied Volatility Analysis (IV patterns and term structure across expiries)\n"
-            f"5. Unusual Options Activity (significant positions, large orders by expiry)\n"
-            f"6. Institutional Positioning Insights (hedging vs. directional bets, calendar spreads)\n"
-            f"7. Term Structure Analysis (how sentiment differs between near-term and longer-term expiries)\n"
-            f"8. Potential Price Targets and Key Levels to Watch\n"
-            f"9. Trading Implications and Strategy Considerations (including multi-leg strategies)\n"
-            f"10. Summary table with key metrics, strike levels, and sentiment signals for each expiry\n"
-        )
-        
-        # Call OpenRouter API
-        print(f"Analyzing options for {ticker} using AI...")
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
-        
-        payload = {
-            "model": self.model,
-            "messages": [
-                {
-                    "role": "system",
-                    "content": system_message
-                },
-                {
-                    "role": "user",
-                    "content": user_message
-                }
-            ]
-        }
-        
-        try:
-            response = requests.post(
-                self.api_url,
-                headers=headers,
-                json=payload,
-                timeout=120
-            )
-            response.raise_for_status()
-            
-            result = response.json()
-            analysis_report = result['choices'][0]['message']['content']
-            
-            return analysis_report
-            
-        except requests.exceptions.RequestException as e:
-            raise Exception(f"Error calling OpenRouter API: {str(e)}")
+    def _significant_label(self, count: int) -> str:
+        """Heading for a chain listing, noting when it was cut to max_rows_in_prompt"""
+        if count > self.max_rows_in_prompt:
+            return f"**Strikes with Significant Activity (OI > 0, top {self.max_rows_in_prompt} by open interest):**"
+        return "**Strikes with Significant Activity (OI > 0):**"
     
-    def analyze_and_save(self, ticker: str, data_dir: str, output_dir: Optional[str] = None) -> str:
+    def _top_strikes(self, df: pd.DataFrame) -> str:
         """
-        Analyze ticker options and save the report to a file
+        Render the most active strikes of a chain as pipe-separated rows
         
         Args:
-            ticker: Stock ticker symbol
-            data_dir: Path to the data directory
-            output_dir: Directory to save the report. If None, saves in data/output/{timestamp}/analyst/option
+            df: Chain rows with open interest
             
         Returns:
-            Path to the saved report file
+            Up to max_rows_in_prompt rows with the highest open interest, in strike order
         """
-        # Perform analysis
-        report = self.analyze(ticker, data_dir)
-        
-        # Determine output path
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
-        if output_dir is None:
-            # Save in data/output/{timestamp}/analyst/option/
-            base_path = Path(data_dir).parent  # Go up from ticker folder to data/raw parent
-            if base_path.name == 'raw':
-                base_path = base_path.parent  # Go up one more level to data/
-            output_dir = base_path / "output" / timestamp / "analyst" / "option"
-        else:
-            output_dir = Path(output_dir)
-        
-        output_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Save report
-        output_file = output_dir / f"{ticker}_option_analysis_{timestamp}.md"
-        
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(f"# Options Chain Analysis Report: {ticker}\n")
-            f.write(f"Generated: {datetime.now().strftime('%B %d, %Y at %I:%M %p')}\n\n")
-            f.write("---\n\n")
-            f.write(report)
-        
-        print(f"Report saved to: {output_file}")
-        return str(output_file)
+        if len(df) > self.max_rows_in_prompt:
+            df = df.nlargest(self.max_rows_in_prompt, 'openInterest').sort_index()
+        return frame_to_prompt(df, index=False)
 
 
 def main():
@@ -8,30 +8,171 @@ This module integrates:
 """
 
 import os
-import pandas as pd
-import requests
-from datetime import datetime
+import copy
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import Dict, Optional, Any, List
+from typing import TYPE_CHECKING, Dict, Optional, Any, Tuple, Union
+from datetime import datetime
+from src.analyst.base import BaseAnalyst, _output_root, frame_to_prompt
+from src.analyst._io import read_csv_tail
+
+# pandas is only needed once CSV files are parsed, which _io imports on first use
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Indicator columns shown in the prompt, in display order
+_KEY_COLUMNS = (
+    'Date', 'Open', 'High', 'Low', 'Close', 'Volume',
+    'SMA_10', 'SMA_20', 'EMA_10', 'EMA_20',
+    'RSI_14', 'MACD', 'MACD_Signal', 'MACD_Hist',
+    'BB_Upper', 'BB_Middle', 'BB_Lower', 'ATR_14'
+)
+_KEY_COLUMN_SET = frozenset(_KEY_COLUMNS)
 
 
-class PriceAnalyst:
+def _format_float(value: float) -> str:
+    """
+    Format a float for the compact indicator tables
+    
+    Keeps six significant digits (%.6g), except that large values such as Volume or OBV
+    are written as whole numbers, since %.6g would switch to scientific notation and drop
+    their low digits.
+    
+    Args:
+        value: Non-missing float from an indicator table
+        
+    Returns:
+        Formatted number
+    """
+    text = "%.6g" % value
+    if "e+" in text:
+        return "%.0f" % value
+    return text
+
+
+class PriceAnalyst(BaseAnalyst):
     """Integrates price chart analysis with technical indicator data"""
     
-    def __init__(self, api_key: Optional[str] = None):
+    SECTION_NAME = "price"
+    REPORT_TITLE = "Integrated Price Analysis Report"
+    REPORT_FILE_TEMPLATE = "{ticker}_integrated_price_analysis_{timestamp}.md"
+    TIMEOUT = 180
+    # Faster model for light prompts (few chart reports or little indicator data) when routing is enabled
+    SMALL_MODEL = "meta-llama/llama-3.1-8b-instruct:free"
+    SMALL_PROMPT_CHARS = 4000
+    # Aligned to_string() indicator tables instead of the compact pipe-separated format
+    PRETTY_TABLES = False
+    # Float formatter for the compact tables: six significant digits, whole numbers for large values
+    FLOAT_FORMAT = staticmethod(_format_float)
+    
+    SYSTEM_MESSAGE = (
+        "You are an expert technical analyst tasked with creating a comprehensive price analysis report. "
+        "You have been provided with:\n"
+        "1. AI-generated chart image analysis reports (basic, short-term, and long-term)\n"
+        "2. Numerical technical indicator data from CSV files across multiple timeframes\n\n"
+        "Your task is to synthesize these data sources into a unified, comprehensive analysis that:\n"
+        "- Validates chart analysis insights with numerical indicator data\n"
+        "- Identifies convergence or divergence between visual patterns and technical indicators\n"
+        "- Provides actionable trading insights backed by both visual and numerical evidence\n"
+        "- Highlights key price levels, trends, and momentum indicators\n"
+        "- Offers clear trading recommendations with risk management guidelines\n\n"
+        "Make sure to include as much detail as possible and provide a summary table at the end "
+        "with key findings organized by timeframe (short-term, medium-term, long-term)."
+        "\n\nPlease provide a comprehensive integrated price analysis that includes:\n"
+        "1. Executive Summary\n"
+        "2. Multi-Timeframe Trend Analysis\n"
+        "3. Technical Indicator Analysis (RSI, MACD, Moving Averages, etc.)\n"
+        "4. Support and Resistance Levels\n"
+        "5. Volume Analysis\n"
+        "6. Momentum and Volatility Assessment\n"
+        "7. Trading Opportunities and Risk Management\n"
+        "8. Short-term, Medium-term, and Long-term Outlook\n"
+        "9. Summary Table with Key Insights by Timeframe"
+    )
+    
+    USER_PROMPT_TEMPLATE = (
+        "Current Date: {current_date}\n"
+        "Company Ticker: {ticker}\n\n"
+        "{formatted_data}\n"
+    )
+    
+    # Rows read from the end of each indicator file; the prompt shows at most the last 12
+    INDICATOR_ROWS = 20
+    
+    # (report type, prompt heading) for each price image report, in prompt order
+    REPORT_SECTIONS = [
+        ('basic', "Basic Chart Analysis (Daily & Weekly)"),
+        ('short_term', "Short-Term Chart Analysis (2-Month Daily)"),
+        ('long_term', "Long-Term Chart Analysis (1-Year Weekly & 4-Year Monthly)"),
+    ]
+    # Characters of each chart report quoted in the prompt
+    REPORT_PREVIEW_CHARS = 2000
+    
+    # (label, column) of the latest values listed under each indicator table
+    LATEST_FIELDS = [
+        ("Date", 'Date'),
+        ("Close", 'Close'),
+        ("RSI(14)", 'RSI_14'),
+        ("MACD", 'MACD'),
+        ("MACD Signal", 'MACD_Signal'),
+        ("Volume", 'Volume'),
+    ]
+    
+    # (file name, data key, loader) for each technical indicator file
+    LOADERS = [
+        ("yfinance_History1y_1wk_indicators.csv", 'weekly_indicators', partial(read_csv_tail, rows=INDICATOR_ROWS)),  # 1-year weekly
+        ("yfinance_History2mo_d_indicators.csv", 'daily_indicators', partial(read_csv_tail, rows=INDICATOR_ROWS)),  # 2-month daily
+        ("yfinance_History4y_1mo_indicators.csv", 'monthly_indicators', partial(read_csv_tail, rows=INDICATOR_ROWS)),  # 4-year monthly
+    ]
+    
+    def __init__(self, api_key: Optional[str] = None, output_base_dir: Optional[str] = None,
+                 route_small_prompts: bool = False, **kwargs):
         """
         Initialize the Price Analyst
         
         Args:
             api_key: OpenRouter API key. If None, will try to get from environment variable OPENROUTER_API_KEY
+            output_base_dir: Base output directory where price_image reports are stored. If None, uses data/output
+            route_small_prompts: Send light prompts to SMALL_MODEL instead of the main model (see _choose_model)
+            **kwargs: Other BaseAnalyst options (use_cache, cache_dir, cache_ttl, enable_prompt_cache, fallback_model)
         """
-        self.api_key = api_key or os.environ.get('OPENROUTER_API_KEY')
-        if not self.api_key:
-            raise ValueError("OpenRouter API key must be provided or set in OPENROUTER_API_KEY environment variable")
+        super().__init__(api_key=api_key, **kwargs)
+        self.output_base_dir = output_base_dir
+        self.small_model = self.SMALL_MODEL if route_small_prompts else None
+    
+    def _with_reports_dir(self, output_base_dir: Optional[str]) -> "PriceAnalyst":
+        """
+        Return an analyst that reads price_image reports from output_base_dir
         
-        self.api_url = "https://openrouter.ai/api/v1/chat/completions"
-        self.model = "xiaomi/mimo-v2-flash:free"
+        Supports the deprecated per-call output_base_dir argument without changing this
+        instance, which may be shared by concurrent analyses.
         
+        Args:
+            output_base_dir: Base output directory passed to analyze or analyze_and_save
+            
+        Returns:
+            This analyst, or a shallow copy using output_base_dir
+        """
+        if output_base_dir is None:
+            return self
+        warnings.warn(
+            "Passing output_base_dir to analyze/analyze_and_save is deprecated; "
+            "pass it to PriceAnalyst() instead",
+            DeprecationWarning,
+            stacklevel=3
+        )
+        analyst = copy.copy(self)
+        analyst.output_base_dir = output_base_dir
+        return analyst
+    
+    def _reports_dir(self, data_dir: str) -> Path:
+        """Base output directory searched for price_image reports"""
+        if self.output_base_dir is not None:
+            return Path(self.output_base_dir)
+        return _output_root(data_dir)
+    
     def find_price_image_reports(self, ticker: str, base_output_dir: str) -> Dict[str, Optional[str]]:
         """
         Find the most recent price image analysis reports
@@ -43,31 +184,38 @@ class PriceAnalyst:
         Returns:
             Dictionary with paths to basic, short-term, and long-term reports
         """
-        base_path = Path(base_output_dir)
         reports = {
             'basic': None,
             'short_term': None,
             'long_term': None
         }
+        prefixes = {
+            'basic': f"{ticker}_price_basic_analysis_",
+            'short_term': f"{ticker}_price_shortterm_analysis_",
+            'long_term': f"{ticker}_price_longterm_analysis_"
+        }
         
-        if not base_path.exists():
+        try:
+            with os.scandir(base_output_dir) as entries:
+                run_dirs = sorted((entry.name for entry in entries if entry.is_dir()), reverse=True)
+        except FileNotFoundError:
             return reports
         
-        # Find the most recent timestamp directory with price_image reports
-        price_image_dirs = sorted(base_path.glob("*/analyst/price_image"), reverse=True)
-        
-        for price_image_dir in price_image_dirs:
-            # Look for the three report types
-            basic_reports = list(price_image_dir.glob(f"{ticker}_price_basic_analysis_*.md"))
-            short_reports = list(price_image_dir.glob(f"{ticker}_price_shortterm_analysis_*.md"))
-            long_reports = list(price_image_dir.glob(f"{ticker}_price_longterm_analysis_*.md"))
+        # Walk the timestamp directories from the most recent one
+        for run_dir in run_dirs:
+            price_image_dir = os.path.join(base_output_dir, run_dir, "analyst", "price_image")
+            try:
+                with os.scandir(price_image_dir) as entries:
+                    names = [entry.name for entry in entries if entry.name.endswith(".md")]
+            except (FileNotFoundError, NotADirectoryError):
+                continue
             
-            if basic_reports and reports['basic'] is None:
-                reports['basic'] = str(basic_reports[0])
-            if short_reports and reports['short_term'] is None:
-                reports['short_term'] = str(short_reports[0])
-            if long_reports and reports['long_term'] is None:
-                reports['long_term'] = str(long_reports[0])
+            # Look for the three report types; the trailing _YYYYMMDD_HHMMSS makes the newest name the largest
+            for report_type, prefix in prefixes.items():
+                if reports[report_type] is None:
+                    match = max((name for name in names if name.startswith(prefix)), default=None)
+                    if match is not None:
+                        reports[report_type] = os.path.join(price_image_dir, match)
             
             # If we found all three, we're done
             if all(reports.values()):
@@ -86,37 +234,10 @@ class PriceAnalyst:
         Returns:
             Dictionary containing dataframes for each timeframe
         """
-        ticker_path = Path(data_dir) / ticker
-        
-        if not ticker_path.exists():
-            raise ValueError(f"Data directory for {ticker} not found at {ticker_path}")
-        
-        data = {
-            'ticker': ticker,
-            'data_path': str(ticker_path)
-        }
-        
-        # Load 1-year weekly indicators
-        weekly_path = ticker_path / "yfinance_History1y_1wk_indicators.csv"
-        if weekly_path.exists():
-            df = pd.read_csv(weekly_path)
-            data['weekly_indicators'] = df
-        
-        # Load 2-month daily indicators
-        daily_path = ticker_path / "yfinance_History2mo_d_indicators.csv"
-        if daily_path.exists():
-            df = pd.read_csv(daily_path)
-            data['daily_indicators'] = df
-        
-        # Load 4-year monthly indicators
-        monthly_path = ticker_path / "yfinance_History4y_1mo_indicators.csv"
-        if monthly_path.exists():
-            df = pd.read_csv(monthly_path)
-            data['monthly_indicators'] = df
-        
-        return data
+        # The three CSV files are parsed concurrently from LOADERS
+        return super().load_data(ticker, data_dir)
     
-    def format_indicator_summary(self, df: pd.DataFrame, timeframe: str, num_recent: int = 10) -> str:
+    def format_indicator_summary(self, df: "pd.DataFrame", timeframe: str, num_recent: int = 10) -> str:
         """
         Format indicator data into a summary string
         
@@ -135,12 +256,10 @@ class PriceAnalyst:
         recent_df = df.tail(num_recent)
         
         # Select key columns if they exist
-        key_columns = ['Date', 'Open', 'High', 'Low', 'Close', 'Volume', 
-                      'SMA_10', 'SMA_20', 'EMA_10', 'EMA_20',
-                      'RSI_14', 'MACD', 'MACD_Signal', 'MACD_Hist',
-                      'BB_Upper', 'BB_Middle', 'BB_Lower', 'ATR_14']
+        present = _KEY_COLUMN_SET.intersection(recent_df.columns)
         
-        available_columns = [col for col in key_columns if col in recent_df.columns]
+        # Columns with no values in the window (e.g. a long moving average on a short history) only cost tokens
+        available_columns = [col for col in _KEY_COLUMNS if col in present and recent_df[col].notna().any()]
         
         if available_columns:
             summary_df = recent_df[available_columns]
@@ -148,23 +267,17 @@ class PriceAnalyst:
             # If key columns don't exist, use first 10 columns
             summary_df = recent_df.iloc[:, :min(10, len(recent_df.columns))]
         
-        output = f"### {timeframe} Indicators (Most Recent {len(recent_df)} periods)\n\n"
-        output += summary_df.to_string(index=False)
-        output += "\n\n"
-        
-        # Add current values summary
-        if len(df) > 0:
-            latest = df.iloc[-1]
-            output += f"**Latest Values ({timeframe}):**\n"
-            output += f"- Date: {latest.get('Date', 'N/A')}\n"
-            output += f"- Close: {latest.get('Close', 'N/A')}\n"
-            output += f"- RSI(14): {latest.get('RSI_14', 'N/A')}\n"
-            output += f"- MACD: {latest.get('MACD', 'N/A')}\n"
-            output += f"- MACD Signal: {latest.get('MACD_Signal', 'N/A')}\n"
-            output += f"- Volume: {latest.get('Volume', 'N/A')}\n"
-            output += "\n"
-        
-        return output
+        # Add current values summary (df is not empty here), leaving out fields without a value
+        latest = df.iloc[-1].dropna()
+        parts = [
+            f"### {timeframe} Indicators (Most Recent {len(recent_df)} periods)\n\n",
+            frame_to_prompt(summary_df, index=False, pretty=self.PRETTY_TABLES, float_format=self.FLOAT_FORMAT),
+            "\n\n",
+            f"**Latest Values ({timeframe}):**\n",
+        ]
+        parts.extend(f"- {label}: {latest[col]}\n" for label, col in self.LATEST_FIELDS if col in latest)
+        parts.append("\n")
+        return "".join(parts)
     
     def load_reports(self, report_paths: Dict[str, Optional[str]]) -> Dict[str, str]:
         """
@@ -176,139 +289,127 @@ class PriceAnalyst:
         Returns:
             Dictionary with report contents
         """
-        reports = {}
-        
-        for report_type, path in report_paths.items():
-            if path and Path(path).exists():
+        def read_report(path: Optional[str]) -> Optional[str]:
+            if not path:
+                return None
+            try:
                 with open(path, 'r', encoding='utf-8') as f:
-                    reports[report_type] = f.read()
-            else:
-                reports[report_type] = f"No {report_type} report available."
+                    return f.read()
+            except FileNotFoundError:
+                return None
         
-        return reports
+        with ThreadPoolExecutor(max_workers=max(1, len(report_paths))) as executor:
+            contents = dict(zip(report_paths, executor.map(read_report, report_paths.values())))
+        
+        return {
+            report_type: content if content is not None else f"No {report_type} report available."
+            for report_type, content in contents.items()
+        }
     
-    def analyze(self, ticker: str, data_dir: str, output_base_dir: Optional[str] = None) -> str:
+    def load_data(self, ticker: str, data_dir: str) -> Dict[str, Any]:
         """
-        Perform integrated price analysis
+        Load the price image reports and the technical indicator data for a ticker
         
         Args:
             ticker: Stock ticker symbol
             data_dir: Path to the data directory
-            output_base_dir: Base output directory where price_image reports are stored
             
         Returns:
-            Comprehensive integrated analysis report
+            Dictionary with the indicator dataframes and a 'reports' dictionary of report contents
         """
-        print(f"Loading data for {ticker}...")
-        
-        # Determine output base directory
-        if output_base_dir is None:
-            base_path = Path(data_dir).parent
-            if base_path.name == 'raw':
-                base_path = base_path.parent
-            output_base_dir = base_path / "output"
-        
-        # Load price image analysis reports
-        print("Finding price image analysis reports...")
-        report_paths = self.find_price_image_reports(ticker, str(output_base_dir))
-        reports = self.load_reports(report_paths)
-        
-        print(f"  Basic report: {'✓' if reports.get('basic') != 'No basic report available.' else '✗'}")
-        print(f"  Short-term report: {'✓' if reports.get('short_term') != 'No short_term report available.' else '✗'}")
-        print(f"  Long-term report: {'✓' if reports.get('long_term') != 'No long_term report available.' else '✗'}")
-        
-        # Load indicator data
-        print("\nLoading technical indicator data...")
-        indicator_data = self.load_indicator_data(ticker, data_dir)
-        
-        # Format the data for the prompt
-        formatted_data = self.format_data_for_prompt(ticker, reports, indicator_data)
-        
-        # Prepare the prompt
-        current_date = datetime.now().strftime("%B %d, %Y")
-        
-        system_message = (
-            "You are an expert technical analyst tasked with creating a comprehensive price analysis report. "
-            "You have been provided with:\n"
-            "1. AI-generated chart image analysis reports (basic, short-term, and long-term)\n"
-            "2. Numerical technical indicator data from CSV files across multiple timeframes\n\n"
-            "Your task is to synthesize these data sources into a unified, comprehensive analysis that:\n"
-            "- Validates chart analysis insights with numerical indicator data\n"
-            "- Identifies convergence or divergence between visual patterns and technical indicators\n"
-            "- Provides actionable trading insights backed by both visual and numerical evidence\n"
-            "- Highlights key price levels, trends, and momentum indicators\n"
-            "- Offers clear trading recommendations with risk management guidelines\n\n"
-            "Make sure to include as much detail as possible and provide a summary table at the end "
-            "with key findings organized by timeframe (short-term, medium-term, long-term)."
-        )
-        
-        user_message = (
-            f"Current Date: {current_date}\n"
-            f"Company Ticker: {ticker}\n\n"
-            f"{formatted_data}\n\n"
-            f"Please provide a comprehensive integrated price analysis that includes:\n"
-            f"1. Executive Summary\n"
-            f"2. Multi-Timeframe Trend Analysis\n"
-            f"3. Technical Indicator Analysis (RSI, MACD, Moving Averages, etc.)\n"
-            f"4. Support and Resistance Levels\n"
-            f"5. Volume Analysis\n"
-            f"6. Momentum and Volatility Assessment\n"
-            f"7. Trading Opportunities and Risk Management\n"
-            f"8. Short-term, Medium-term, and Long-term Outlook\n"
-            f"9. Summary Table with Key Insights by Timeframe\n"
-        )
-        
-        # Call OpenRouter API
-        print(f"\nAnalyzing {ticker} using AI...")
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
+        # Report discovery and the indicator CSVs are independent, so load them side by side
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            reports_future = executor.submit(self._find_and_load_reports, ticker, data_dir)
+            data_future = executor.submit(self.load_indicator_data, ticker, data_dir)
+            
+            print("Finding price image analysis reports...")
+            reports = reports_future.result()
+            
+            print(f"  Basic report: {'✓' if reports.get('basic') != 'No basic report available.' else '✗'}")
+            print(f"  Short-term report: {'✓' if reports.get('short_term') != 'No short_term report available.' else '✗'}")
+            print(f"  Long-term report: {'✓' if reports.get('long_term') != 'No long_term report available.' else '✗'}")
+            
+            # Load indicator data
+            print("\nLoading technical indicator data...")
+            data = data_future.result()
         
-        payload = {
-            "model": self.model,
-            "messages": [
-                {
-                    "role": "system",
-                    "content": system_message
-                },
-                {
-                    "role": "user",
-                    "content": user_message
-                }
-            ]
-        }
+        data['reports'] = reports
+        return data
+    
+    def _find_and_load_reports(self, ticker: str, data_dir: str) -> Dict[str, str]:
+        """Locate the newest price image reports for a ticker and read them"""
+        return self.load_reports(self.find_price_image_reports(ticker, str(self._reports_dir(data_dir))))
+    
+    def _choose_model(self, data: Dict[str, Any], formatted_data: str) -> str:
+        """
+        Route light prompts to the small model when route_small_prompts is enabled
         
-        try:
-            response = requests.post(
-                self.api_url,
-                headers=headers,
-                json=payload,
-                timeout=180
-            )
-            response.raise_for_status()
-            
-            result = response.json()
-            analysis_report = result['choices'][0]['message']['content']
+        Args:
+            data: Dictionary returned by load_data
+            formatted_data: Data block of the user prompt
             
-            return analysis_report
+        Returns:
+            OpenRouter model name
+        """
+        available_reports = sum(1 for report in data['reports'].values() if not self._is_placeholder(report))
+        if self.small_model and (len(formatted_data) < self.SMALL_PROMPT_CHARS or available_reports < 2):
+            return self.small_model
+        return self.model
+    
+    def _data_fingerprint(self, ticker_path: Path) -> Tuple:
+        """
+        Summarize the input files, including the price image reports in the output directory
+        
+        Args:
+            ticker_path: Folder holding the ticker's data files
             
-        except requests.exceptions.RequestException as e:
-            raise Exception(f"Error calling OpenRouter API: {str(e)}")
+        Returns:
+            Fingerprint of the ticker folder and the newest price image reports
+        """
+        report_paths = self.find_price_image_reports(ticker_path.name, str(self._reports_dir(str(ticker_path.parent))))
+        reports = []
+        for report_type, path in sorted(report_paths.items()):
+            if path is not None:
+                stat = os.stat(path)
+                reports.append((report_type, path, stat.st_mtime_ns, stat.st_size))
+        return super()._data_fingerprint(ticker_path) + tuple(reports)
+    
+    @staticmethod
+    def _is_placeholder(report: str) -> bool:
+        """Whether a report is the stand-in text load_reports uses for a missing report"""
+        return report.startswith("No ") and report.endswith(" report available.")
+    
+    @staticmethod
+    def _strip_header(report: str) -> str:
+        """Drop the title block of a saved report, which ends at the first '---' rule"""
+        _, separator, body = report.partition('---\n\n')
+        return body if separator else report
     
-    def format_data_for_prompt(self, ticker: str, reports: Dict[str, str], 
-                               indicator_data: Dict[str, Any]) -> str:
+    def format_data_for_prompt(self, data: Union[Dict[str, Any], str], reports: Optional[Dict[str, str]] = None,
+                               indicator_data: Optional[Dict[str, Any]] = None) -> str:
         """
         Format all data sources into a comprehensive prompt
         
         Args:
-            ticker: Stock ticker symbol
-            reports: Dictionary of report contents
-            indicator_data: Dictionary of indicator dataframes
+            data: Dictionary returned by load_data (indicator dataframes and report contents).
+                The deprecated form format_data_for_prompt(ticker, reports, indicator_data) is still accepted
+            reports: Deprecated; dictionary of report contents
+            indicator_data: Deprecated; dictionary of indicator dataframes
             
         Returns:
             Formatted string for the AI prompt
         """
+        if reports is not None:
+            warnings.warn(
+                "format_data_for_prompt(ticker, reports, indicator_data) is deprecated; "
+                "pass the dictionary returned by load_data instead",
+                DeprecationWarning,
+                stacklevel=2
+            )
+            data = {**(indicator_data or {}), 'ticker': data, 'reports': reports}
+        
+        ticker = data['ticker']
+        reports = data['reports']
         sections = []
         
         sections.append(f"# Integrated Price Analysis Data for {ticker}\n")
@@ -316,54 +417,64 @@ class PriceAnalyst:
         # Section 1: Chart Image Analysis Reports
         sections.append("## Part 1: Chart Image Analysis Reports\n")
         
-        if reports.get('basic'):
-            sections.append("### Basic Chart Analysis (Daily & Weekly)\n")
-            # Extract just the analysis content, skip the header
-            basic_content = reports['basic'].split('---\n\n', 1)[-1] if '---\n\n' in reports['basic'] else reports['basic']
-            sections.append(basic_content[:2000] + "...\n" if len(basic_content) > 2000 else basic_content)
-            sections.append("")
-        
-        if reports.get('short_term'):
-            sections.append("### Short-Term Chart Analysis (2-Month Daily)\n")
-            short_content = reports['short_term'].split('---\n\n', 1)[-1] if '---\n\n' in reports['short_term'] else reports['short_term']
-            sections.append(short_content[:2000] + "...\n" if len(short_content) > 2000 else short_content)
-            sections.append("")
-        
-        if reports.get('long_term'):
-            sections.append("### Long-Term Chart Analysis (1-Year Weekly & 4-Year Monthly)\n")
-            long_content = reports['long_term'].split('---\n\n', 1)[-1] if '---\n\n' in reports['long_term'] else reports['long_term']
-            sections.append(long_content[:2000] + "...\n" if len(long_content) > 2000 else long_content)
-            sections.append("")
+        for report_type, heading in self.REPORT_SECTIONS:
+            # Missing reports are left out rather than described by a placeholder
+            if reports.get(report_type) and not self._is_placeholder(reports[report_type]):
+                sections.append(f"### {heading}\n")
+                # Extract just the analysis content, skip the header
+                content = self._strip_header(reports[report_type])
+                sections.append(content[:self.REPORT_PREVIEW_CHARS] + "...\n" if content[self.REPORT_PREVIEW_CHARS:] else content)
+                sections.append("")
         
         # Section 2: Technical Indicator Data
         sections.append("## Part 2: Technical Indicator Data\n")
         
-        if 'daily_indicators' in indicator_data:
+        if 'daily_indicators' in data:
             sections.append(self.format_indicator_summary(
-                indicator_data['daily_indicators'], 
+                data['daily_indicators'], 
                 "2-Month Daily",
                 num_recent=10
             ))
         
-        if 'weekly_indicators' in indicator_data:
+        if 'weekly_indicators' in data:
             sections.append(self.format_indicator_summary(
-                indicator_data['weekly_indicators'], 
+                data['weekly_indicators'], 
                 "1-Year Weekly",
                 num_recent=10
             ))
         
-        if 'monthly_indicators' in indicator_data:
+        if 'monthly_indicators' in data:
             sections.append(self.format_indicator_summary(
-                indicator_data['monthly_indicators'], 
+                data['monthly_indicators'], 
                 "4-Year Monthly",
                 num_recent=12
             ))
         
         return "\n".join(sections)
     
-    def analyze_and_save(self, ticker: str, data_dir: str, 
-                        output_dir: Optional[str] = None,
-                        output_base_dir: Optional[str] = None) -> str:
+    def analyze(self, ticker: str, data_dir: str, now: Optional[datetime] = None, *,
+                output_base_dir: Optional[str] = None) -> str:
+        """
+        Perform integrated price analysis
+        
+        Args:
+            ticker: Stock ticker symbol
+            data_dir: Path to the data directory
+            now: Time of the run used for the prompt date. If None, uses the current time
+            output_base_dir: Deprecated; pass output_base_dir to the constructor instead
+            
+        Returns:
+            Comprehensive integrated analysis report
+        """
+        if isinstance(now, (str, os.PathLike)):
+            # Legacy analyze(ticker, data_dir, output_base_dir) call
+            now, output_base_dir = None, now
+        analyst = self._with_reports_dir(output_base_dir)
+        return super(PriceAnalyst, analyst).analyze(ticker, data_dir, now)
+    
+    def analyze_and_save(self, ticker: str, data_dir: str, output_dir: Optional[str] = None, *,
+                         stream: bool = True, run_timestamp: Optional[str] = None,
+                         output_base_dir: Optional[str] = None) -> str:
         """
         Analyze a ticker and save the integrated report
         
@@ -371,7 +482,9 @@ class PriceAnalyst:
             ticker: Stock ticker symbol
             data_dir: Path to the data directory
             output_dir: Directory to save the report. If None, saves in data/output/{timestamp}/analyst/price
-            output_base_dir: Base output directory where price_image reports are stored
+            stream: Write the report to disk as the model generates it
+            run_timestamp: Timestamp shared by the whole run (see BaseAnalyst.analyze_and_save)
+            output_base_dir: Deprecated; pass output_base_dir to the constructor instead
             
         Returns:
             Path to the saved report file
@@ -380,66 +493,57 @@ class PriceAnalyst:
         print(f"Integrated Price Analysis for {ticker}")
         print(f"{'='*60}\n")
         
-        # Perform analysis
-        report = self.analyze(ticker, data_dir, output_base_dir)
-        
-        # Determine output path
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
-        if output_dir is None:
-            # Save in data/output/{timestamp}/analyst/price/
-            base_path = Path(data_dir).parent
-            if base_path.name == 'raw':
-                base_path = base_path.parent
-            output_dir = base_path / "output" / timestamp / "analyst" / "price"
-        else:
-            output_dir = Path(output_dir)
-        
-        output_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Save report
-        output_file = output_dir / f"{ticker}_integrated_price_analysis_{timestamp}.md"
-        
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(f"# Integrated Price Analysis Report: {ticker}\n")
-            f.write(f"Generated: {datetime.now().strftime('%B %d, %Y at %I:%M %p')}\n")
-            f.write(f"Analysis Type: Chart Analysis + Technical Indicators\n\n")
-            f.write("---\n\n")
-            f.write(report)
-        
-        print(f"\n{'='*60}")
-        print(f"✓ Report saved to: {output_file}")
-        print(f"{'='*60}\n")
-        
-        return str(output_file)
+        analyst = self._with_reports_dir(output_base_dir)
+        return super(PriceAnalyst, analyst).analyze_and_save(ticker, data_dir, output_dir, stream, run_timestamp)
+    
+    def _report_header(self, ticker: str, now: Optional[datetime] = None, model: Optional[str] = None) -> str:
+        """Title block written at the top of every saved report, including the model that wrote it"""
+        return (
+            f"# {self.REPORT_TITLE}: {ticker}\n"
+            f"Generated: {(now or datetime.now()).strftime('%B %d, %Y at %I:%M %p')}\n"
+            "Analysis Type: Chart Analysis + Technical Indicators\n"
+            f"Model: {model or self.model}\n\n"
+            "---\n\n"
+        )
 
 
 def main():
     """Example usage of the Price Analyst"""
     import argparse
+    import asyncio
     
-    parser = argparse.ArgumentParser(description='Perform integrated price analysis for a stock ticker')
-    parser.add_argument('ticker', type=str, help='Stock ticker symbol (e.g., GOOGL)')
+    parser = argparse.ArgumentParser(description='Perform integrated price analysis for one or more stock tickers')
+    parser.add_argument('tickers', type=str, nargs='+', help='Stock ticker symbol(s) (e.g., GOOGL MSFT)')
     parser.add_argument('--data-dir', type=str, required=True, help='Path to data directory')
     parser.add_argument('--api-key', type=str, help='OpenRouter API key (or set OPENROUTER_API_KEY env var)')
     parser.add_argument('--output-dir', type=str, help='Directory to save report (default: auto-generated)')
     parser.add_argument('--output-base-dir', type=str, help='Base directory where price_image reports are stored')
+    parser.add_argument('--route-small-prompts', action='store_true',
+                        help=f'Analyze light prompts with {PriceAnalyst.SMALL_MODEL} instead of the main model')
+    parser.add_argument('--max-concurrency', type=int, default=8, help='Maximum number of tickers analyzed concurrently')
     
     args = parser.parse_args()
     
     # Initialize analyst
-    analyst = PriceAnalyst(api_key=args.api_key)
+    analyst = PriceAnalyst(
+        api_key=args.api_key,
+        output_base_dir=args.output_base_dir,
+        route_small_prompts=args.route_small_prompts
+    )
     
-    # Analyze and save report
-    report_path = analyst.analyze_and_save(
-        ticker=args.ticker,
+    # Analyze and save reports, overlapping the OpenRouter calls of the different tickers
+    successful, failed = asyncio.run(analyst.analyze_and_save_many_async(
+        tickers=args.tickers,
         data_dir=args.data_dir,
         output_dir=args.output_dir,
-        output_base_dir=args.output_base_dir
-    )
+        max_concurrency=args.max_concurrency
+    ))
     
-    print(f"\n✓ Integrated analysis complete!")
-    print(f"Report: {report_path}")
+    print(f"\n✓ Integrated analysis complete! ({len(successful)}/{len(args.tickers)} succeeded)")
+    for ticker, report_path in successful.items():
+        print(f"Report ({ticker}): {report_path}")
+    for ticker, error in failed.items():
+        print(f"✗ {ticker}: {error}")
 
 
 if __name__ == "__main__":
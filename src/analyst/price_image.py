@@ -8,30 +8,134 @@ This module analyzes price chart images including:
 """
 
 import os
-import base64
-import requests
+import re
+from urllib.parse import quote
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
+from src.analyst.base import BaseAnalyst
 
+# pybase64 is a SIMD drop-in for the stdlib module; use it when installed
+try:
+    import pybase64 as base64
+except ImportError:
+    import base64
 
-class PriceImageAnalyst:
+# System message for analyze_all; each image group carries its own instructions in the user turn
+COMBINED_SYSTEM_MESSAGE = (
+    "You are an expert technical analyst specializing in price chart analysis. "
+    "You will receive several groups of charts for one company. Each group starts with a line "
+    "'<<<SECTION:<name>>>' followed by the instructions for that group, then its charts. "
+    "Write a separate, complete report for every group, using only that group's charts. Start each report "
+    "with a line '<<<SECTION:<name>>>' and end it with a line '<<<END>>>'. Do not write anything outside these blocks."
+)
+_SECTION_REPLY_RE = re.compile(r"<<<SECTION:([a-z_]+)>>>\s*(.*?)\s*<<<END>>>", re.S)
+
+
+class PriceImageAnalyst(BaseAnalyst):
     """Analyzes price chart images using AI vision models"""
     
-    def __init__(self, api_key: Optional[str] = None):
+    SECTION_NAME = "price_image"
+    MODEL = "google/gemini-3-flash-preview"
+    TIMEOUT = 180
+    
+    # (analysis type, report file slug, report title, progress heading, charts analyzed) in report order
+    ANALYSES = [
+        ('basic', 'basic', "Basic", "Basic Price Charts (Daily & Weekly)",
+         "Daily and Weekly Price Charts"),
+        ('short_term', 'shortterm', "Short-Term", "Short-Term Charts (2-Month Daily)",
+         "2-Month Daily Technical Indicators"),
+        ('long_term', 'longterm', "Long-Term", "Long-Term Charts (1-Year Weekly & 4-Year Monthly)",
+         "1-Year Weekly & 4-Year Monthly Technical Indicators"),
+    ]
+    
+    # System message for each analysis type
+    SYSTEM_MESSAGES = {
+        'basic': (
+            "You are an expert technical analyst specializing in price chart analysis. "
+            "Analyze the provided daily and weekly price charts to identify key price levels, "
+            "trends, patterns, and potential support/resistance zones. "
+            "Provide detailed insights that can help traders make informed decisions. "
+            "Include a summary table at the end with key observations."
+        ),
+        'short_term': (
+            "You are an expert technical analyst specializing in short-term trading analysis. "
+            "Analyze the provided 2-month daily charts showing momentum indicators, price overlays, and volume. "
+            "Focus on recent price action, momentum shifts, and short-term trading opportunities. "
+            "Provide detailed and actionable insights for short-term traders. "
+            "Include a summary table at the end with key indicators and signals."
+        ),
+        'long_term': (
+            "You are an expert technical analyst specializing in long-term trend analysis. "
+            "Analyze the provided 1-year weekly and 4-year monthly charts showing momentum, price overlays, and volume. "
+            "Focus on major trends, long-term patterns, and structural changes in price behavior. "
+            "Provide comprehensive insights for long-term investors and position traders. "
+            "Include a summary table at the end with key long-term trends and levels."
+        ),
+    }
+    
+    # str.format_map templates with {current_date} and {ticker} for each analysis type
+    USER_PROMPT_TEMPLATES = {
+        'basic': (
+            "Current Date: {current_date}\n"
+            "Company Ticker: {ticker}\n\n"
+            "Please analyze the following daily and weekly price charts:\n\n"
+            "Provide a comprehensive technical analysis including:\n"
+            "1. Overall trend direction (short-term and medium-term)\n"
+            "2. Key support and resistance levels\n"
+            "3. Chart patterns (if any)\n"
+            "4. Moving averages and their significance\n"
+            "5. Volume analysis\n"
+            "6. Trading recommendations based on the charts\n"
+            "7. Summary table with key price levels and observations\n"
+        ),
+        'short_term': (
+            "Current Date: {current_date}\n"
+            "Company Ticker: {ticker}\n\n"
+            "Please analyze the following 2-month daily technical indicator charts:\n\n"
+            "Provide a comprehensive short-term technical analysis including:\n"
+            "1. Momentum indicators analysis (RSI, MACD, etc.)\n"
+            "2. Price overlays and moving averages\n"
+            "3. Volume patterns and anomalies\n"
+            "4. Short-term trend strength and direction\n"
+            "5. Overbought/oversold conditions\n"
+            "6. Entry and exit signals for short-term trades\n"
+            "7. Risk levels and stop-loss suggestions\n"
+            "8. Summary table with key indicators and their current signals\n"
+        ),
+        'long_term': (
+            "Current Date: {current_date}\n"
+            "Company Ticker: {ticker}\n\n"
+            "Please analyze the following 1-year weekly and 4-year monthly technical charts:\n\n"
+            "Provide a comprehensive long-term technical analysis including:\n"
+            "1. Major trend analysis (primary and secondary trends)\n"
+            "2. Long-term support and resistance zones\n"
+            "3. Chart patterns on different timeframes\n"
+            "4. Long-term momentum and trend strength\n"
+            "5. Volume trends and their significance\n"
+            "6. Structural changes in price behavior\n"
+            "7. Long-term investment outlook\n"
+            "8. Summary table with key long-term trends and price levels\n"
+        ),
+    }
+    
+    def __init__(self, api_key: Optional[str] = None, single_request: bool = False,
+                 image_base_url: Optional[str] = None, **kwargs):
         """
         Initialize the Price Image Analyst
         
         Args:
             api_key: OpenRouter API key. If None, will try to get from environment variable OPENROUTER_API_KEY
+            single_request: Send all chart groups of a ticker in one request (see analyze_all)
+            image_base_url: Public URL the data directory's ticker folders are served from. When set,
+                charts are passed by URL instead of being read and base64-encoded into the request
+            **kwargs: Other BaseAnalyst options (use_cache, cache_dir, cache_ttl, enable_prompt_cache, fallback_model)
         """
-        self.api_key = api_key or os.environ.get('OPENROUTER_API_KEY')
-        if not self.api_key:
-            raise ValueError("OpenRouter API key must be provided or set in OPENROUTER_API_KEY environment variable")
-        
-        self.api_url = "https://openrouter.ai/api/v1/chat/completions"
-        self.model = "google/gemini-3-flash-preview"
-        
+        super().__init__(api_key=api_key, **kwargs)
+        self.single_request = single_request
+        self.image_base_url = image_base_url.rstrip('/') if image_base_url else None
+    
     def encode_image(self, image_path: str) -> str:
         """
         Encode an image file to base64
@@ -43,7 +147,20 @@ class PriceImageAnalyst:
             Base64 encoded string of the image
         """
         with open(image_path, 'rb') as image_file:
-            return base64.b64encode(image_file.read()).decode('utf-8')
+            return base64.b64encode(image_file.read()).decode('ascii')
+    
+    def image_url(self, image_path: str) -> str:
+        """
+        Build the public URL of a chart image under image_base_url
+        
+        Args:
+            image_path: Path to the image file inside a ticker folder
+            
+        Returns:
+            URL of the image
+        """
+        ticker_dir, file_name = Path(image_path).parts[-2:]
+        return f"{self.image_base_url}/{quote(ticker_dir)}/{quote(file_name)}"
     
     def find_chart_images(self, ticker: str, data_dir: str) -> dict:
         """
@@ -105,97 +222,74 @@ class PriceImageAnalyst:
         
         return images
     
-    def analyze_images(self, image_paths: List[str], analysis_type: str, ticker: str) -> str:
+    def load_data(self, ticker: str, data_dir: str, include: Optional[Set[str]] = None) -> Dict[str, Any]:
+        """Not used: chart analyses read images (see find_chart_images) rather than data files"""
+        raise NotImplementedError("PriceImageAnalyst analyzes chart images; use analyze or analyze_and_save")
+    
+    def format_data_for_prompt(self, data: Dict[str, Any]) -> str:
+        """Not used: chart prompts are built per analysis type by _build_prompts"""
+        raise NotImplementedError("PriceImageAnalyst analyzes chart images; use analyze or analyze_and_save")
+    
+    def _build_prompts(self, analysis_type: str, ticker: str) -> Tuple[str, str]:
         """
-        Analyze a set of chart images
+        Build the system message and user prompt for one analysis type
         
         Args:
-            image_paths: List of paths to image files
             analysis_type: Type of analysis ('basic', 'short_term', 'long_term')
             ticker: Stock ticker symbol
             
         Returns:
-            Analysis report from the AI
+            Tuple of (system message, user prompt)
         """
-        if not image_paths:
-            return f"No images found for {analysis_type} analysis."
-        
         current_date = datetime.now().strftime("%B %d, %Y")
+        system_message = self.SYSTEM_MESSAGES[analysis_type]
+        user_prompt = self.USER_PROMPT_TEMPLATES[analysis_type].format_map(
+            {'current_date': current_date, 'ticker': ticker}
+        )
+        
+        return system_message, user_prompt
+    
+    def _analysis_cache_path(self, system_message: str, user_prompt: str, image_paths: List[str]) -> Path:
+        """Report cache file for a prompt and image set; the images are identified by their file stats"""
+        return self._report_cache_path(system_message, user_prompt + self._images_fingerprint(image_paths))
+    
+    def _encode_images(self, image_paths: List[str], analysis_type: str) -> List[Dict[str, Any]]:
+        """
+        Encode chart images as image_url message parts, skipping files that cannot be read
         
-        # Prepare system messages based on analysis type
-        if analysis_type == 'basic':
-            system_message = (
-                "You are an expert technical analyst specializing in price chart analysis. "
-                "Analyze the provided daily and weekly price charts to identify key price levels, "
-                "trends, patterns, and potential support/resistance zones. "
-                "Provide detailed insights that can help traders make informed decisions. "
-                "Include a summary table at the end with key observations."
-            )
-            user_prompt = (
-                f"Current Date: {current_date}\n"
-                f"Company Ticker: {ticker}\n\n"
-                f"Please analyze the following daily and weekly price charts:\n\n"
-                f"Provide a comprehensive technical analysis including:\n"
-                f"1. Overall trend direction (short-term and medium-term)\n"
-                f"2. Key support and resistance levels\n"
-                f"3. Chart patterns (if any)\n"
-                f"4. Moving averages and their significance\n"
-                f"5. Volume analysis\n"
-                f"6. Trading recommendations based on the charts\n"
-                f"7. Summary table with key price levels and observations\n"
-            )
-        elif analysis_type == 'short_term':
-            system_message = (
-                "You are an expert technical analyst specializing in short-term trading analysis. "
-                "Analyze the provided 2-month daily charts showing momentum indicators, price overlays, and volume. "
-                "Focus on recent price action, momentum shifts, and short-term trading opportunities. "
-                "Provide detailed and actionable insights for short-term traders. "
-                "Include a summary table at the end with key indicators and signals."
-            )
-            user_prompt = (
-                f"Current Date: {current_date}\n"
-                f"Company Ticker: {ticker}\n\n"
-                f"Please analyze the following 2-month daily technical indicator charts:\n\n"
-                f"Provide a comprehensive short-term technical analysis including:\n"
-                f"1. Momentum indicators analysis (RSI, MACD, etc.)\n"
-                f"2. Price overlays and moving averages\n"
-                f"3. Volume patterns and anomalies\n"
-                f"4. Short-term trend strength and direction\n"
-                f"5. Overbought/oversold conditions\n"
-                f"6. Entry and exit signals for short-term trades\n"
-                f"7. Risk levels and stop-loss suggestions\n"
-                f"8. Summary table with key indicators and their current signals\n"
-            )
-        else:  # long_term
-            system_message = (
-                "You are an expert technical analyst specializing in long-term trend analysis. "
-                "Analyze the provided 1-year weekly and 4-year monthly charts showing momentum, price overlays, and volume. "
-                "Focus on major trends, long-term patterns, and structural changes in price behavior. "
-                "Provide comprehensive insights for long-term investors and position traders. "
-                "Include a summary table at the end with key long-term trends and levels."
-            )
-            user_prompt = (
-                f"Current Date: {current_date}\n"
-                f"Company Ticker: {ticker}\n\n"
-                f"Please analyze the following 1-year weekly and 4-year monthly technical charts:\n\n"
-                f"Provide a comprehensive long-term technical analysis including:\n"
-                f"1. Major trend analysis (primary and secondary trends)\n"
-                f"2. Long-term support and resistance zones\n"
-                f"3. Chart patterns on different timeframes\n"
-                f"4. Long-term momentum and trend strength\n"
-                f"5. Volume trends and their significance\n"
-                f"6. Structural changes in price behavior\n"
-                f"7. Long-term investment outlook\n"
-                f"8. Summary table with key long-term trends and price levels\n"
-            )
-        
-        # Encode all images
+        With image_base_url set the files are not read at all; each part carries the image's URL.
+        
+        Args:
+            image_paths: List of paths to image files
+            analysis_type: Type of analysis, for progress output
+            
+        Returns:
+            Message content parts in image order
+        """
+        if self.image_base_url:
+            print(f"Linking {len(image_paths)} images for {analysis_type} analysis...")
+            return [
+                {"type": "image_url", "image_url": {"url": self.image_url(img_path)}}
+                for img_path in image_paths
+            ]
+        
+        # Encode all images; file reads and base64 work overlap across threads
         print(f"Encoding {len(image_paths)} images for {analysis_type} analysis...")
         image_contents = []
         
-        for img_path in image_paths:
+        def encode(img_path: str) -> Tuple[Optional[str], Optional[Exception]]:
             try:
-                encoded_image = self.encode_image(img_path)
+                return self.encode_image(img_path), None
+            except Exception as e:
+                return None, e
+        
+        with ThreadPoolExecutor(max_workers=min(8, len(image_paths))) as executor:
+            encoded_images = list(executor.map(encode, image_paths))
+        
+        for img_path, (encoded_image, error) in zip(image_paths, encoded_images):
+            if error is not None:
+                print(f"  ✗ Error encoding {img_path}: {str(error)}")
+            else:
                 image_contents.append({
                     "type": "image_url",
                     "image_url": {
@@ -203,58 +297,200 @@ class PriceImageAnalyst:
                     }
                 })
                 print(f"  ✓ Encoded: {Path(img_path).name}")
-            except Exception as e:
-                print(f"  ✗ Error encoding {img_path}: {str(e)}")
         
+        return image_contents
+    
+    def analyze_images(self, image_paths: List[str], analysis_type: str, ticker: str) -> str:
+        """
+        Analyze a set of chart images
+        
+        Args:
+            image_paths: List of paths to image files
+            analysis_type: Type of analysis ('basic', 'short_term', 'long_term')
+            ticker: Stock ticker symbol
+            
+        Returns:
+            Analysis report from the AI
+        """
+        if not image_paths:
+            return f"No images found for {analysis_type} analysis."
+        
+        system_message, user_prompt = self._build_prompts(analysis_type, ticker)
+        
+        # Reuse the report for an unchanged prompt and image set, before paying for the encoding
+        cache_path = self._analysis_cache_path(system_message, user_prompt, image_paths)
+        if self.use_cache:
+            cached_report = self._read_cached_report(cache_path)
+            if cached_report is not None:
+                print(f"Using cached {analysis_type} analysis for {ticker}")
+                return cached_report
+        
+        image_contents = self._encode_images(image_paths, analysis_type)
         if not image_contents:
             return f"Failed to encode any images for {analysis_type} analysis."
         
         # Prepare the API request
         print(f"Analyzing {ticker} using AI ({analysis_type})...")
         
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
-        
         # Build the user message content with images
         user_content = [
             {"type": "text", "text": user_prompt}
         ]
         user_content.extend(image_contents)
         
-        payload = {
-            "model": self.model,
-            "messages": [
-                {
-                    "role": "system",
-                    "content": system_message
-                },
-                {
-                    "role": "user",
-                    "content": user_content
-                }
-            ]
-        }
-        
+        # Sent over the pooled OpenRouter session, with retries on transient failures
         try:
-            response = requests.post(
-                self.api_url,
-                headers=headers,
-                json=payload,
-                timeout=180
-            )
-            response.raise_for_status()
+            report, answered_by = self._complete(system_message, user_content)
+        except Exception as e:
+            raise Exception(f"{analysis_type} analysis failed: {str(e)}")
+        
+        self._cache_reply(cache_path, report, self.model, answered_by)
+        return report
+    
+    def analyze_all(self, images: Dict[str, List[str]], ticker: str) -> Dict[str, str]:
+        """
+        Run several chart analyses in a single multimodal request
+        
+        Each image group is introduced by its own instructions and the model answers with one
+        delimited report per group. Cached reports are reused, and a group the model skips or
+        mangles is retried on its own.
+        
+        Args:
+            images: Image paths by analysis type, as returned by find_chart_images
+            ticker: Stock ticker symbol
             
-            result = response.json()
-            analysis_report = result['choices'][0]['message']['content']
+        Returns:
+            Dictionary mapping each analysis type with images to its report
+        """
+        reports = {}
+        pending = []
+        for analysis_type, image_paths in images.items():
+            if not image_paths:
+                continue
+            system_message, user_prompt = self._build_prompts(analysis_type, ticker)
+            cache_path = self._analysis_cache_path(system_message, user_prompt, image_paths)
+            cached_report = self._read_cached_report(cache_path) if self.use_cache else None
+            if cached_report is not None:
+                print(f"Using cached {analysis_type} analysis for {ticker}")
+                reports[analysis_type] = cached_report
+            else:
+                pending.append((analysis_type, system_message, user_prompt, cache_path))
+        
+        if not pending:
+            return reports
+        if len(pending) == 1:
+            analysis_type = pending[0][0]
+            reports[analysis_type] = self.analyze_images(images[analysis_type], analysis_type, ticker)
+            return reports
+        
+        # One user turn: each group's instructions followed by its charts
+        user_content = []
+        sent = []
+        for analysis_type, system_message, user_prompt, cache_path in pending:
+            image_contents = self._encode_images(images[analysis_type], analysis_type)
+            if not image_contents:
+                reports[analysis_type] = f"Failed to encode any images for {analysis_type} analysis."
+                continue
+            user_content.append({
+                "type": "text",
+                "text": f"<<<SECTION:{analysis_type}>>>\n{system_message}\n\n{user_prompt}"
+            })
+            user_content.extend(image_contents)
+            sent.append((analysis_type, cache_path))
+        if not sent:
+            return reports
+        
+        print(f"Analyzing {ticker} using AI ({', '.join(t for t, _ in sent)} in one request)...")
+        try:
+            response, answered_by = self._complete(COMBINED_SYSTEM_MESSAGE, user_content)
+        except Exception as e:
+            raise Exception(f"Combined chart analysis failed: {str(e)}")
+        reply = {match.group(1): match.group(2) for match in _SECTION_REPLY_RE.finditer(response)}
+        
+        for analysis_type, cache_path in sent:
+            report = reply.get(analysis_type)
+            if not report:
+                # The model skipped or mangled this group's block
+                reports[analysis_type] = self.analyze_images(images[analysis_type], analysis_type, ticker)
+                continue
+            self._cache_reply(cache_path, report, self.model, answered_by)
+            reports[analysis_type] = report
+        
+        return reports
+    
+    def _submit_analyses(self, executor: ThreadPoolExecutor, images: Dict[str, List[str]],
+                         ticker: str) -> Dict[str, Future]:
+        """
+        Start the analyses of every chart group that has images
+        
+        Args:
+            executor: Pool running the API calls
+            images: Image paths by analysis type, as returned by find_chart_images
+            ticker: Stock ticker symbol
             
-            return analysis_report
+        Returns:
+            Future by analysis type. With single_request every future is the same
+            analyze_all call, whose result is the dictionary of all reports
+        """
+        pending = [analysis_type for analysis_type, *_ in self.ANALYSES if images[analysis_type]]
+        if self.single_request:
+            combined = executor.submit(self.analyze_all, images, ticker)
+            return {analysis_type: combined for analysis_type in pending}
+        # The analyses are independent API calls, so send them at the same time
+        return {
+            analysis_type: executor.submit(self.analyze_images, images[analysis_type], analysis_type, ticker)
+            for analysis_type in pending
+        }
+    
+    def analyze(self, ticker: str, data_dir: str) -> Dict[str, str]:
+        """
+        Analyze all chart images for a ticker without saving the reports
+        
+        Args:
+            ticker: Stock ticker symbol
+            data_dir: Path to the data directory
             
-        except requests.exceptions.RequestException as e:
-            raise Exception(f"Error calling OpenRouter API for {analysis_type}: {str(e)}")
+        Returns:
+            Dictionary mapping each analysis type with charts to its report; failed analyses are
+            reported and left out, and an exception is raised only if every analysis failed
+        """
+        images = self.find_chart_images(ticker, data_dir)
+        reports = {}
+        failed = {}
+        with ThreadPoolExecutor(max_workers=len(self.ANALYSES)) as executor:
+            futures = self._submit_analyses(executor, images, ticker)
+            for analysis_type, future in futures.items():
+                try:
+                    reports[analysis_type] = self._group_result(future, analysis_type)
+                except Exception as e:
+                    print(f"✗ Error in {analysis_type} analysis for {ticker}: {e}")
+                    failed[analysis_type] = str(e)
+        
+        if failed and not reports:
+            raise Exception(f"All chart analyses failed for {ticker}: {failed}")
+        return reports
+    
+    def _group_result(self, future: Future, analysis_type: str) -> str:
+        """Report of one chart group from a future started by _submit_analyses"""
+        report = future.result()
+        if self.single_request:
+            report = report[analysis_type]
+        return report
     
-    def analyze_and_save(self, ticker: str, data_dir: str, output_dir: Optional[str] = None) -> List[str]:
+    @staticmethod
+    def _images_fingerprint(image_paths: List[str]) -> str:
+        """Identify an image set by each file's path, size and modification time"""
+        parts = []
+        for img_path in image_paths:
+            try:
+                stat = os.stat(img_path)
+                parts.append(f"{img_path}|{stat.st_size}|{stat.st_mtime_ns}")
+            except OSError:
+                parts.append(f"{img_path}|missing")
+        return "\0" + "\0".join(parts)
+    
+    def analyze_and_save(self, ticker: str, data_dir: str, output_dir: Optional[str] = None,
+                         stream: bool = False, run_timestamp: Optional[str] = None) -> List[str]:
         """
         Analyze all chart images for a ticker and save reports
         
@@ -262,10 +498,16 @@ class PriceImageAnalyst:
             ticker: Stock ticker symbol
             data_dir: Path to the data directory
             output_dir: Directory to save the reports. If None, saves in data/output/{timestamp}/analyst/price_image
+            stream: Not supported; chart reports are written once complete, so this must be False
+            run_timestamp: Timestamp (YYYYMMDD_HHMMSS) shared by every report of one run. If None, uses the current time
             
         Returns:
-            List of paths to the saved report files
+            List of paths to the saved report files. Failed analyses are reported and skipped, so the
+            other reports are still written; an exception is raised only if every analysis failed
         """
+        if stream:
+            raise ValueError("Chart image analyses cannot be streamed; call analyze_and_save with stream=False")
+        
         print(f"\n{'='*60}")
         print(f"Starting Price Chart Image Analysis for {ticker}")
         print(f"{'='*60}\n")
@@ -279,89 +521,54 @@ class PriceImageAnalyst:
         print(f"Found {len(images['long_term'])} long-term charts\n")
         
         # Determine output path
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
-        if output_dir is None:
-            # Save in data/output/{timestamp}/analyst/price_image/
-            base_path = Path(data_dir).parent  # Go up from ticker folder to data/raw parent
-            if base_path.name == 'raw':
-                base_path = base_path.parent  # Go up one more level to data/
-            output_dir = base_path / "output" / timestamp / "analyst" / "price_image"
-        else:
-            output_dir = Path(output_dir)
-        
-        output_dir.mkdir(parents=True, exist_ok=True)
+        timestamp = run_timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_dir = self._prepare_output_dir(data_dir, output_dir, timestamp, create=False)
         
         saved_reports = []
+        failed = {}
         
-        # Analysis 1: Basic charts (daily and weekly)
-        print(f"\n{'='*60}")
-        print("Analysis 1/3: Basic Price Charts (Daily & Weekly)")
-        print(f"{'='*60}\n")
-        
-        if images['basic']:
-            report1 = self.analyze_images(images['basic'], 'basic', ticker)
-            output_file1 = output_dir / f"{ticker}_price_basic_analysis_{timestamp}.md"
+        with ThreadPoolExecutor(max_workers=len(self.ANALYSES)) as executor:
+            futures = self._submit_analyses(executor, images, ticker)
             
-            with open(output_file1, 'w', encoding='utf-8') as f:
-                f.write(f"# Price Chart Analysis (Basic): {ticker}\n")
-                f.write(f"Generated: {datetime.now().strftime('%B %d, %Y at %I:%M %p')}\n")
-                f.write(f"Charts Analyzed: Daily and Weekly Price Charts\n\n")
-                f.write("---\n\n")
-                f.write(report1)
-            
-            print(f"✓ Report 1 saved to: {output_file1}")
-            saved_reports.append(str(output_file1))
-        else:
-            print("⚠ No basic charts found, skipping analysis 1")
-        
-        # Analysis 2: Short-term charts (2 months daily)
-        print(f"\n{'='*60}")
-        print("Analysis 2/3: Short-Term Charts (2-Month Daily)")
-        print(f"{'='*60}\n")
-        
-        if images['short_term']:
-            report2 = self.analyze_images(images['short_term'], 'short_term', ticker)
-            output_file2 = output_dir / f"{ticker}_price_shortterm_analysis_{timestamp}.md"
-            
-            with open(output_file2, 'w', encoding='utf-8') as f:
-                f.write(f"# Price Chart Analysis (Short-Term): {ticker}\n")
-                f.write(f"Generated: {datetime.now().strftime('%B %d, %Y at %I:%M %p')}\n")
-                f.write(f"Charts Analyzed: 2-Month Daily Technical Indicators\n\n")
-                f.write("---\n\n")
-                f.write(report2)
-            
-            print(f"✓ Report 2 saved to: {output_file2}")
-            saved_reports.append(str(output_file2))
-        else:
-            print("⚠ No short-term charts found, skipping analysis 2")
-        
-        # Analysis 3: Long-term charts (1 year weekly + 4 year monthly)
-        print(f"\n{'='*60}")
-        print("Analysis 3/3: Long-Term Charts (1-Year Weekly & 4-Year Monthly)")
-        print(f"{'='*60}\n")
-        
-        if images['long_term']:
-            report3 = self.analyze_images(images['long_term'], 'long_term', ticker)
-            output_file3 = output_dir / f"{ticker}_price_longterm_analysis_{timestamp}.md"
-            
-            with open(output_file3, 'w', encoding='utf-8') as f:
-                f.write(f"# Price Chart Analysis (Long-Term): {ticker}\n")
-                f.write(f"Generated: {datetime.now().strftime('%B %d, %Y at %I:%M %p')}\n")
-                f.write(f"Charts Analyzed: 1-Year Weekly & 4-Year Monthly Technical Indicators\n\n")
-                f.write("---\n\n")
-                f.write(report3)
-            
-            print(f"✓ Report 3 saved to: {output_file3}")
-            saved_reports.append(str(output_file3))
-        else:
-            print("⚠ No long-term charts found, skipping analysis 3")
+            for number, (analysis_type, slug, title, heading, charts) in enumerate(self.ANALYSES, 1):
+                print(f"\n{'='*60}")
+                print(f"Analysis {number}/{len(self.ANALYSES)}: {heading}")
+                print(f"{'='*60}\n")
+                
+                if analysis_type not in futures:
+                    print(f"⚠ No {title.lower()} charts found, skipping analysis {number}")
+                    continue
+                
+                # Each analysis is collected on its own so one failure does not discard the others
+                try:
+                    report = self._group_result(futures[analysis_type], analysis_type)
+                except Exception as e:
+                    print(f"✗ Analysis {number} failed: {e}")
+                    failed[analysis_type] = str(e)
+                    continue
+                output_file = output_dir / f"{ticker}_price_{slug}_analysis_{timestamp}.md"
+                
+                with self._open_report(output_file) as f:
+                    f.write(
+                        f"# Price Chart Analysis ({title}): {ticker}\n"
+                        f"Generated: {datetime.now().strftime('%B %d, %Y at %I:%M %p')}\n"
+                        f"Charts Analyzed: {charts}\n\n"
+                        "---\n\n"
+                        f"{report}"
+                    )
+                
+                print(f"✓ Report {number} saved to: {output_file}")
+                saved_reports.append(str(output_file))
         
         print(f"\n{'='*60}")
         print(f"Price Chart Image Analysis Complete!")
         print(f"Total Reports Generated: {len(saved_reports)}")
+        if failed:
+            print(f"✗ Failed analyses: {', '.join(failed)}")
         print(f"{'='*60}\n")
         
+        if failed and not saved_reports:
+            raise Exception(f"All chart analyses failed for {ticker}: {failed}")
         return saved_reports
 
 
@@ -374,11 +581,19 @@ def main():
     parser.add_argument('--data-dir', type=str, required=True, help='Path to data directory')
     parser.add_argument('--api-key', type=str, help='OpenRouter API key (or set OPENROUTER_API_KEY env var)')
     parser.add_argument('--output-dir', type=str, help='Directory to save reports (default: auto-generated)')
+    parser.add_argument('--single-request', action='store_true',
+                        help='Analyze all chart groups in one API request instead of one request per group')
+    parser.add_argument('--image-base-url', type=str,
+                        help='Public URL serving the data directory; charts are sent as links instead of inline base64')
     
     args = parser.parse_args()
     
     # Initialize analyst
-    analyst = PriceImageAnalyst(api_key=args.api_key)
+    analyst = PriceImageAnalyst(
+        api_key=args.api_key,
+        single_request=args.single_request,
+        image_base_url=args.image_base_url
+    )
     
     # Analyze and save reports
     report_paths = analyst.analyze_and_save(
@@ -2,8 +2,9 @@ import json
 import time
 import threading
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from typing import Dict, List, Optional, Union
+from concurrent.futures import ThreadPoolExecutor
 
 # Constants
 HEADERS = {
@@ -11,6 +12,17 @@ HEADERS = {
                   "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
     "Referer": "https://news.google.com/"
 }
+# Only the article containers (and their children) are needed from a topic page.
+# The class attribute is not split into tokens yet while straining, so match the tokens by hand.
+ARTICLE_STRAINER = SoupStrainer(
+    "div", class_=lambda value: bool(value) and "IBr9hb" in (value.split() if isinstance(value, str) else value)
+)
+# Seconds a parsed topic page is reused; the pages are not ticker-specific
+NEWS_CACHE_TTL = 300
+
+# url -> (monotonic fetch time, parsed items), shared by every collector in the process
+_news_cache: Dict[str, tuple] = {}
+_news_cache_lock = threading.Lock()
 
 class RateLimiter:
     """Thread-safe rate limiter for API calls."""
@@ -20,12 +32,14 @@ class RateLimiter:
         self.last = 0.0
 
     def wait(self):
+        # Reserve the next free slot under the lock, then sleep outside it
+        # so other threads can claim the following slots in the meantime.
         with self.lock:
-            current = time.time()
-            elapsed = current - self.last
-            if elapsed < self.interval:
-                time.sleep(self.interval - elapsed)
-            self.last = time.time()
+            slot = max(time.monotonic(), self.last + self.interval)
+            self.last = slot
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
 
 class GoogleNewsCollector:
     """
@@ -46,12 +60,28 @@ class GoogleNewsCollector:
 
     def _get_news_from_url(self, url: str) -> List[Dict[str, str]]:
         """Internal helper to scrape news from a specific Google News topic URL."""
+        with _news_cache_lock:
+            cached = _news_cache.get(url)
+        if cached is not None and time.monotonic() - cached[0] < NEWS_CACHE_TTL:
+            return list(cached[1])
+        
+        news_items = self._fetch_news_from_url(url)
+        # Failed fetches come back empty; don't pin them for the whole TTL
+        if news_items:
+            with _news_cache_lock:
+                _news_cache[url] = (time.monotonic(), news_items)
+        return list(news_items)
+
+    def _fetch_news_from_url(self, url: str) -> List[Dict[str, str]]:
+        """Download and parse one Google News topic page."""
         self.limiter.wait()
         try:
             resp = requests.get(url, headers=HEADERS, timeout=30)
             resp.raise_for_status()
             
-            soup = BeautifulSoup(resp.text, "html.parser")
+            # lxml parses the raw bytes in C (detecting the charset itself) and
+            # builds tree nodes only for the article containers.
+            soup = BeautifulSoup(resp.content, "lxml", parse_only=ARTICLE_STRAINER)
             news_items = []
             
             # Find all article containers
@@ -98,10 +128,15 @@ class GoogleNewsCollector:
         """
         Fetch all news data (US and World) and return as a JSON string.
         """
-        results = {
-            "US_News": self.get_us_news(),
-            "World_News": self.get_world_news()
-        }
+        # The two pages are independent; the limiter still spaces the requests,
+        # but one page is parsed while the other is being fetched.
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            us_future = executor.submit(self.get_us_news)
+            world_future = executor.submit(self.get_world_news)
+            results = {
+                "US_News": us_future.result(),
+                "World_News": world_future.result()
+            }
         return results
 
 if __name__ == "__main__":
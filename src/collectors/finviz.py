@@ -24,12 +24,14 @@ class RateLimiter:
         self.last = 0.0
 
     def wait(self):
+        # Reserve the next free slot under the lock, then sleep outside it
+        # so other threads can claim the following slots in the meantime.
         with self.lock:
-            current = time.time()
-            elapsed = current - self.last
-            if elapsed < self.interval:
-                time.sleep(self.interval - elapsed)
-            self.last = time.time()
+            slot = max(time.monotonic(), self.last + self.interval)
+            self.last = slot
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
 
 class FinvizCollector:
     """